@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+#
+# get_win_changelog.py
+#
+# Get the CPU's added and removed between the releases of Windows.
+# For each vendor, compare each release with the release before it, and write
+# the changes to win_cpu_changelog.json
+#
+# Any two releases can also be compared. E.g. what 24H2 dropped from 22H2:
+# $ python3 get_win_changelog.py --from windows_10_22h2 --to windows_11_24h2
+#
+# The CPU models of each release are sorted once. Each comparison is then a single
+# pass over the two sorted lists (a merge join).
+
+import sys
+import argparse
+import contextlib
+import io
+import json
+
+import get_win_unsupported
+from win_cpu_vendors import vendors
+
+changelog_file = "win_cpu_changelog.json"
+
+
+def main():
+    """
+    Load the CPU models of each release of each vendor and sort them.
+    Compare adjacent releases, or the two releases given, and print the counts.
+    Without --from and --to, write the changes of adjacent releases to the changelog.
+    """
+    args = get_args()
+
+    print("\nCPU's added and removed between Windows releases.")
+
+    vendor_releases = load_sorted_releases()
+
+    if args.release_from or args.release_to:
+        if not (args.release_from and args.release_to):
+            sys.exit("Use both --from and --to.")
+        if not any(args.release_from in releases and args.release_to in releases
+                for releases in vendor_releases.values()):
+            sys.exit("No vendor has both releases {} and {}. Releases: {}".format(
+                args.release_from, args.release_to, ", ".join(sorted({release
+                    for releases in vendor_releases.values() for release in releases},
+                    key=get_win_unsupported.release_sort_key))))
+        for vendor, releases in vendor_releases.items():
+            if args.release_from not in releases or args.release_to not in releases:
+                continue
+            added, removed = merge_diff(releases[args.release_from], releases[args.release_to])
+            print("\n{} {} to {}".format(vendor, args.release_from, args.release_to))
+            print("Added:   {:>4}".format(len(added)))
+            for model in added:
+                print("  +", model)
+            print("Removed: {:>4}".format(len(removed)))
+            for model in removed:
+                print("  -", model)
+        return
+
+    changelog = make_changelog(vendor_releases)
+    for vendor, change_list in changelog.items():
+        print("\n{}".format(vendor))
+        for change in change_list:
+            print("{} to {}: added {:>4}, removed {:>4}".format(change["from"], change["to"],
+                len(change["added"]), len(change["removed"])))
+
+    with open(changelog_file, 'w') as fout:
+        fout.write(json.dumps(changelog, separators=(",", ":")))
+    print("\nChangelog written to: {}".format(changelog_file))
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description="Get the CPU's added and removed between Windows releases.")
+    parser.add_argument("--from", dest="release_from", metavar="RELEASE",
+        help="Earlier release. E.g. windows_10_22h2")
+    parser.add_argument("--to", dest="release_to", metavar="RELEASE",
+        help="Later release. E.g. windows_11_24h2")
+    return parser.parse_args()
+
+
+def load_sorted_releases():
+    """
+    Return the sorted CPU models of each release of each vendor, in release order:
+    {'intel': {'windows_10_2004': ['3205U', ...], ...}, 'amd': {...}}
+    The CPU models come from get_win_unsupported, so files that have not changed
+    are not loaded again. The header row is left out.
+    """
+    cache = get_win_unsupported.load_cache()
+    vendor_file_lists = {vendor: get_win_unsupported.get_json_file_list(vendor)
+        for vendor in vendors}
+
+    vendor_releases = {}
+    for vendor, file_list in vendor_file_lists.items():
+        if not file_list:
+            continue
+        title_list = get_win_unsupported.get_json_title_list(file_list)
+        # Without the console output of get_win_unsupported.
+        with contextlib.redirect_stdout(io.StringIO()):
+            cpu_list_array, digest_list = get_win_unsupported.get_cpu_list_array(
+                file_list, title_list, cache)
+        releases = {}
+        for index, title in enumerate(title_list):
+            release = title.rsplit("_", 1)[0]
+            releases[release] = sorted(cpu_list_array[index])
+        vendor_releases[vendor] = releases
+
+    get_win_unsupported.save_cache(cache, sum(vendor_file_lists.values(), []))
+    return vendor_releases
+
+
+def make_changelog(vendor_releases):
+    """
+    Compare each release with the release before it:
+    {'intel': [{'from': 'windows_10_2004', 'to': 'windows_10_20h2',
+                'added': ['i3-10100', ...], 'removed': [...]}, ...], 'amd': [...]}
+    """
+    changelog = {}
+    for vendor, releases in vendor_releases.items():
+        change_list = []
+        release_list = list(releases)
+        for index in range(1, len(release_list)):
+            added, removed = merge_diff(releases[release_list[index-1]],
+                releases[release_list[index]])
+            change_list.append({"from": release_list[index-1], "to": release_list[index],
+                "added": added, "removed": removed})
+        changelog[vendor] = change_list
+    return changelog
+
+
+def merge_diff(old_list, new_list):
+    """
+    Compare two sorted lists in a single pass. Returns (added, removed):
+    added   in new_list but not old_list
+    removed in old_list but not new_list
+    """
+    added = []
+    removed = []
+    i = 0
+    j = 0
+    while i < len(old_list) and j < len(new_list):
+        if old_list[i] == new_list[j]:
+            i += 1
+            j += 1
+        elif old_list[i] < new_list[j]:
+            removed.append(old_list[i])
+            i += 1
+        else:
+            added.append(new_list[j])
+            j += 1
+    removed.extend(old_list[i:])
+    added.extend(new_list[j:])
+    return added, removed
+
+
+if __name__=="__main__":
+
+    main()
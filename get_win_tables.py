@@ -4,6 +4,38 @@
 #
 # Get Windows Supported CPU lists from the Microsoft webspages since 2020.
 # Extract the data and save in sub_directory win_cpu/ as both .json and .csv files.
+# The downloaded webpages are kept in sub_directory html_cache/. On the next run only
+# the webpages that have changed are downloaded and parsed again. Use --offline to
+# rebuild win_cpu/ from html_cache/ without using the network.
+# Use --sqlite win_cpu.db to also write all the tables to one SQLite database.
+# Use --stats stats.json to save the time, bytes and rows of each link and stage.
+# Use --qualcomm to also get the Qualcomm lists, and --before-2020 to also get the
+# Windows 10 releases 1709 to 1909.
+# Use --discover to get the links from the Windows Processor Requirements webpage
+# instead of link_list. New releases are then found without editing link_list.
+# Requests to the website are started at no more than --rate a second.
+#
+# Each request has a connect and read timeout. Timeouts, connection errors and
+# server errors are tried again --retries times, after a random wait that doubles
+# each time. A webpage that still fails, or has no CPU table, does not stop the run.
+# Its .json and .csv files from the previous run are kept. The run ends with a
+# summary of the tables refreshed, not modified and failed, and exits with status 1
+# if any failed.
+#
+# A table that is the same as the table of another release, E.g. Windows 10 2004,
+# 20H2 and 21H1 AMD, is stored once. Its .json and .csv files are hard links to the
+# files of the first release with that table. The sha256 of each table is kept in
+# html_cache/cache_index.json
+#
+# Use --format to write the tables as compact .json, or with orjson or msgpack if
+# they are installed. See win_cpu_serial.py. The default is indented .json.
+# Tables that have not changed since the last run keep the format they were written in.
+#
+# Each table that has changed since the last run is compared with its previous
+# table. The CPU's added, removed and rebranded are added to the end of the
+# feed win_cpu_feed.jsonl. See win_cpu_feed.py
+# If the previous tables have been removed from win_cpu/, the changes are not known
+# and nothing is added to the feed.
 #
 # Objective:
 # Collect the data in order to determine which CPU's were supported on Windows 10,
@@ -17,51 +49,461 @@
 
 import os
 import sys
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import hashlib
+import random
+import re
+import threading
+import time
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urldefrag
 import json
 import csv
+import sqlite3
+
+import win_cpu_feed
+import win_cpu_serial
+from win_cpu_stats import stats
+from win_cpu_table import CpuTable
+from win_cpu_vendors import get_vendor, vendors
 
 sub_directory = "win_cpu"
+cache_directory = "html_cache"
+cache_index_file = cache_directory + "/cache_index.json"
+workers_default = 4
+rate_default = 5.0
+# Seconds to connect and to wait for data.
+timeout_default = (10, 30)
+retries_default = 3
+# The wait before a retry is random, up to backoff_base * 2**try seconds.
+backoff_base = 0.5
+backoff_max = 8.0
+retry_status_set = {429, 500, 502, 503, 504}
+index_url = "https://learn.microsoft.com/en-us/windows-hardware/design/minimum/windows-processor-requirements"
+# E.g. windows-11-24h2-supported-intel-processors or windows-11-supported-amd-processors
+supported_link_pattern = re.compile(r"windows-(10|11)(-\d{4}|-\d\dh\d)?-supported-([a-z]+)-processors")
+chunk_size = 64 * 1024
 
 def main():
     """
     Use link_list to get Microsoft Windows webpages with Supported CPU tables.
     Create a filename from the Microsoft URL link.
+    Get the webpage once.
     Get the date of the document from the webpage.
     Append the date to the filename
     Get the desired data from the tables and place in a dictionary
     Save the dictionary to .json file.
     Save the dictionary data to .csv file.
+
+    The webpages are fetched by a pool of worker threads sharing one
+    HTTP session. Results are handled in link_list order, so the console output
+    and the files are the same as a serial run (--workers 1).
+
+    Webpages are saved in the html_cache sub-directory with their ETag and
+    Last-Modified headers. Webpages that have not changed since the last run are
+    not parsed again and their .json and .csv files are left as they are.
+
+    With --sqlite the tables are also written to the database, in one transaction.
+    With --stats the timings and counters of each link and stage are saved.
+    The changes to each table since the last run are added to the end of the feed.
     """
-    print("\nExtracting Supported CPU data from Microsoft website...")
+    # Imported here, so the programs that only use the functions of this module,
+    # and not the network, start quickly.
+    import requests
+
+    args = get_args()
+    if args.stats:
+        stats.enable()
+
+    if args.offline:
+        print("\nExtracting Supported CPU data from cached webpages in: {}".format(cache_directory))
+    else:
+        print("\nExtracting Supported CPU data from Microsoft website...")
+
+    session = get_session(args.workers)
+    rate_limiter = RateLimiter(args.rate)
+    timeout = (timeout_default[0], args.timeout)
+    serializer = win_cpu_serial.get_serializer(args.format)
 
     #print(link_list)  # [['Windows 10 2004- AMD processors', 'https://learn.microsoft.com/...],...]
+    if args.discover:
+        print("\nFinding the webpages linked from: {}".format(args.index_url))
+        page_link_list = discover_links(session, args.index_url, rate_limiter, args.retries, timeout)
+        print("Webpages found: {}".format(len(page_link_list)))
+    else:
+        page_link_list = get_link_list(args.qualcomm, args.before_2020)
+
+    cache_index = load_cache_index()
+    # The file of each table already written: {'<sha256>': 'windows-10-2004-amd-2021-11-10', ...}
+    table_files = {}
+    for entry in cache_index.values():
+        if "sha256" in entry:
+            table_files.setdefault(entry["sha256"], entry["filename"])
+    table_list = []
+    refreshed_list = []
+    not_modified_list = []
+    failed_list = []
+    feed_list = []
+
+    def fetch_page(entry):
+        # Return the error of a webpage that failed, so the others still get done.
+        try:
+            return get_page(entry[1], session, cache_index.get(entry[1], {}), args.offline,
+                rate_limiter, args.retries, timeout) + (None,)
+        except requests.RequestException as error:
+            return None, {}, error
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        # map() yields the webpages in the order of link_list.
+        page_list = executor.map(fetch_page, page_link_list)
+
+        for index, (html, cache_entry, error) in enumerate(page_list):
+            title_str = page_link_list[index][0]
+            link = page_link_list[index][1]
+            if cache_entry is None:
+                print("\n" + title_str)
+                print("No cached webpage for:", link)
+                continue
+            if error is None and html is not None:
+                # Load the previous table before it could be written over.
+                previous_filename = cache_index.get(link, {}).get("filename")
+                previous_table = None
+                if tables_exist(previous_filename):
+                    previous_table = load_previous_table(previous_filename)
+                try:
+                    full_filename, cpu_table, digest = write_tables(title_str, link, html,
+                        table_files, serializer)
+                except ValueError as parse_error:
+                    error = parse_error
+                else:
+                    feed_record = None
+                    if previous_filename and previous_table is None:
+                        # The previous tables were removed. Their changes are not
+                        # known, and the feed already has their models.
+                        print("No previous tables to compare, not added to feed:",
+                            previous_filename)
+                    else:
+                        feed_record = win_cpu_feed.make_record(full_filename,
+                            previous_filename, previous_table, cpu_table)
+                    if feed_record is not None:
+                        print_feed_record(feed_record)
+                        feed_list.append(feed_record)
+            elif error is not None:
+                print("\n" + title_str)
+            if error is not None:
+                # Keep the tables of the previous run.
+                print("Failed:", error)
+                full_filename = cache_index.get(link, {}).get("filename")
+                if not tables_exist(full_filename):
+                    print("No previous tables for:", link)
+                    failed_list.append((title_str, None))
+                    continue
+                print("Previous tables kept:", full_filename)
+                failed_list.append((title_str, full_filename))
+                if args.sqlite:
+                    table_list.append((full_filename, load_previous_table(full_filename)))
+                continue
+            if html is None:
+                print("\n" + title_str)
+                print("Not modified since last run:", cache_entry["filename"])
+                full_filename = cache_entry["filename"]
+                if args.sqlite:
+                    cpu_table = load_previous_table(full_filename)
+                not_modified_list.append(title_str)
+            else:
+                cache_entry["filename"] = full_filename
+                cache_entry["sha256"] = digest
+                table_files.setdefault(digest, full_filename)
+                refreshed_list.append(title_str)
+            cache_index[link] = cache_entry
+            if args.sqlite:
+                table_list.append((full_filename, cpu_table))
+
+    save_cache_index(cache_index)
+    if feed_list:
+        win_cpu_feed.append_records(feed_list, args.feed)
+
+    if args.sqlite:
+        with stats.stage("sqlite", args.sqlite) as record:
+            dump_to_sqlite(table_list, args.sqlite)
+            record["output_bytes"] = os.path.getsize(args.sqlite)
+        print("\nTables written to database: {}".format(args.sqlite))
+
+    print("\nTables refreshed:     {:>3}".format(len(refreshed_list)))
+    print("Tables not modified:  {:>3}".format(len(not_modified_list)))
+    print("Tables failed:        {:>3}".format(len(failed_list)))
+    print("Tables changed:       {:>3}".format(len(feed_list)))
+    for title_str, full_filename in failed_list:
+        print("  {}: {}".format(title_str, "previous tables kept" if full_filename else "no tables"))
+
+    if args.stats:
+        stats.dump(args.stats)
+        print("\nStats written to: {}".format(args.stats))
+
+    print("\nCompleted. json and csv files in subdirectory: {}".format(sub_directory))
+    if failed_list:
+        sys.exit(1)
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description="Get the Windows Supported CPU tables from the Microsoft website.")
+    parser.add_argument("-w", "--workers", type=int, default=workers_default,
+        help="Number of webpages to fetch at the same time. Default: {}".format(workers_default))
+    parser.add_argument("--offline", action="store_true",
+        help="Do not use the network. Rebuild the files from the webpages in {}/".format(cache_directory))
+    parser.add_argument("--sqlite", metavar="DATABASE", default=None,
+        help="Also write the tables to this SQLite database. E.g. win_cpu.db")
+    parser.add_argument("--stats", metavar="FILE", default=None,
+        help="Save the time, bytes and rows of each link and stage to this .json file.")
+    parser.add_argument("--qualcomm", action="store_true",
+        help="Also get the Qualcomm processor lists.")
+    parser.add_argument("--before-2020", action="store_true",
+        help="Also get the Windows 10 releases 1709 to 1909.")
+    parser.add_argument("--discover", action="store_true",
+        help="Get the links of every release and vendor from the index webpage.")
+    parser.add_argument("--index-url", default=index_url,
+        help="Index webpage for --discover. Default: {}".format(index_url))
+    parser.add_argument("--rate", type=float, default=rate_default,
+        help="Most requests to start a second. 0 for no limit. Default: {}".format(rate_default))
+    parser.add_argument("--retries", type=int, default=retries_default,
+        help="Times to try a webpage again after a timeout or server error. Default: {}".format(
+            retries_default))
+    parser.add_argument("--timeout", type=float, default=timeout_default[1],
+        help="Seconds to wait for data from the website. Default: {}".format(timeout_default[1]))
+    parser.add_argument("--format", choices=list(win_cpu_serial.serializer_types), default="json",
+        help="Format of the table files. The .csv files are always written. Default: json")
+    parser.add_argument("--feed", default=win_cpu_feed.feed_file,
+        help="Add the changes to the tables to this feed. Default: {}".format(
+            win_cpu_feed.feed_file))
+    args = parser.parse_args()
+    try:
+        win_cpu_serial.get_serializer(args.format)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.workers < 1:
+        parser.error("--workers must be 1 or more")
+    if args.rate < 0:
+        parser.error("--rate must be 0 or more")
+    if args.retries < 0 or args.timeout <= 0:
+        parser.error("--retries must be 0 or more and --timeout more than 0")
+    if args.discover and args.offline:
+        parser.error("--discover needs the network")
+    return args
+
+
+def get_link_list(qualcomm=False, before_2020=False):
+    """
+    Return link_list, with the Qualcomm links and the links of the releases
+    before 2020 if asked for. Older releases first.
+    """
+    page_link_list = list(link_list)
+    if qualcomm:
+        page_link_list += link_list_qualcomm
+    if before_2020:
+        page_link_list = [entry for entry in link_list_before_2020
+            if qualcomm or get_vendor(entry[1].split("/").pop().split("-")) != "qualcomm"
+            ] + page_link_list
+    return page_link_list
+
+
+def discover_links(session, url=index_url, rate_limiter=None, retries=retries_default,
+        timeout=timeout_default):
+    """
+    Get the Windows Processor Requirements webpage and return a link_list of the
+    supported processor webpages it links to. E.g.
+    [['Windows 11 24H2 - Intel processors', 'https://learn.microsoft.com/.../windows-11-24h2-supported-intel-processors'], ...]
+    Links are in the order of the webpage. A webpage linked more than once is only
+    kept once. Links of unknown vendors, Windows 7, 8.1 and LTSB are left out.
+    """
+    with stats.stage("discover", url) as record:
+        response = get_response(session, url, {}, rate_limiter, retries, timeout, record)
+        parser = LinkParser()
+        parser.feed(decode_html(response.content))
+        parser.close()
+
+    page_link_list = []
+    name_set = set()
+    for href, text in parser.links:
+        link = urldefrag(urljoin(url, href))[0].split("?")[0].rstrip("/")
+        name = link.split("/").pop().lower()
+        match = supported_link_pattern.fullmatch(name)
+        if match is None or match.group(3) not in vendors or name in name_set:
+            continue
+        name_set.add(name)
+        page_link_list.append([text or name, link])
+    return page_link_list
+
+
+class LinkParser(HTMLParser):
+    """
+    Collect the href and text of each <a> tag: [('windows-11-24h2-supported-intel-processors',
+    'Windows 11 24H2 - Intel processors'), ...]
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.href = None
+        self.text = []
 
-    for index in range(len(link_list)):
-        title_str = link_list[index][0]
-        link = link_list[index][1]
-        print("\n" + title_str)
-        #print(link)
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self.href = dict(attrs).get("href")
+            self.text = []
 
-        filename, directory = create_filename(link, title_str)
-        #print(filename) #, directory)
+    def handle_endtag(self, tag):
+        if tag == "a" and self.href is not None:
+            self.links.append((self.href, " ".join("".join(self.text).split())))
+            self.href = None
 
+    def handle_data(self, data):
+        if self.href is not None:
+            self.text.append(data)
+
+
+class RateLimiter:
+    """
+    Start no more than rate requests a second, shared by the worker threads.
+    A rate of 0 is no limit.
+    """
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+        time.sleep(start - now)
+
+
+def get_session(workers):
+    """
+    Create one HTTP session for all the webpages. Connections to the
+    Microsoft website are kept alive and reused, with a pool large enough
+    for each of the worker threads.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def print_feed_record(feed_record):
+    if feed_record["from"] is None:
+        print("First table of this release: {} CPU's added to feed".format(
+            len(feed_record["added"])))
+        return
+    print("Changed since {}: added {}, removed {}, rebranded {}".format(feed_record["from"],
+        len(feed_record["added"]), len(feed_record["removed"]), len(feed_record["rebranded"])))
+
+
+def write_tables(title_str, link, html, table_files={}, serializer=win_cpu_serial.PrettyJson()):
+    """
+    From the webpage html, get the date and the table of CPU's and
+    write them to the table file of the serializer, E.g. .json, and the .csv file.
+    Raises ValueError, and writes nothing, if the date or the table is not found.
+
+    The table is identified by the sha256 of its table file. If table_files has the
+    files of the same table, they are hard linked instead of written again.
+    Returns (full_filename, cpu_table, sha256)
+    """
+    print("\n" + title_str)
+    #print(link)
+
+    filename, directory = create_filename(link, title_str)
+    #print(filename) #, directory)
+
+    with stats.stage("parse", link) as record:
         # Get document date and add it to filename
-        date_str = get_date(link)
+        date_str = get_date(html)
         #print(date_str)
         full_filename = filename + "-" + date_str
         #print("Sub-directory and File name: {}{}".format(directory, full_filename))
 
-        # Get the dictionary of data
-        data_dict = get_dict(link)
-        #print(data_dict)
+        # Get the table of data
+        cpu_table = get_dict(html, record)
 
-        # Write the dictionary out to .json and .csv files.
-        dump_to_json(data_dict, directory, full_filename)
-        dump_to_csv(data_dict, directory, full_filename)
+    # Don't replace the tables of the previous run with a changed or broken webpage.
+    if not date_str:
+        raise ValueError("No document date in the webpage")
+    if len(cpu_table) < 2:
+        raise ValueError("No CPU table in the webpage")
+    # Take off 1 for the header row.
+    print("Entries in dictionary:", len(cpu_table)-1)
+
+    with stats.stage("write", link) as record:
+        path = directory + full_filename
+        table_file = path + serializer.extension
+        # Write the table to a new file, and get the sha256 as it is written.
+        # Not named .tmp, as link_tables() uses that name for its links.
+        dump_file = table_file + ".dump.tmp"
+        digest = dump_table(cpu_table, dump_file, serializer)
+        same_filename = table_files.get(digest)
+        if (same_filename and same_filename != full_filename and tables_exist(same_filename)
+                and link_tables(directory, same_filename, full_filename, serializer.extension)):
+            os.remove(dump_file)
+            record["tables_linked"] = 1
+            record["output_bytes"] = 0
+        else:
+            # Write the table out to the table and .csv files.
+            os.replace(dump_file, table_file)
+            dump_to_csv(cpu_table, directory, full_filename)
+            record["output_bytes"] = os.path.getsize(table_file) + os.path.getsize(path + ".csv")
+
+        # Remove the table of this release in any other format.
+        for extension in win_cpu_serial.table_extensions:
+            if extension != serializer.extension and os.path.exists(path + extension):
+                os.remove(path + extension)
+
+    return full_filename, cpu_table, digest
+
+
+def dump_table(cpu_table, filename, serializer):
+    # Write the table with the serializer. Return the sha256 of the bytes written.
+    with open(filename, 'wb') as fout:
+        writer = HashWriter(fout)
+        serializer.dump(cpu_table.to_dict(), writer)
+    return writer.sha256.hexdigest()
+
+
+class HashWriter:
+    # Pass the bytes written on to the file, and hash them.
+    def __init__(self, fout):
+        self.fout = fout
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.fout.write(data)
+
+
+def link_tables(directory, same_filename, full_filename, table_extension=".json"):
+    """
+    Hard link the table and .csv files of full_filename to those of same_filename.
+    Returns False if the file system can't, and the files are written instead.
+    """
+    try:
+        for extension in (table_extension, ".csv"):
+            source = directory + same_filename + extension
+            target = directory + full_filename + extension
+            if os.path.exists(target) and os.path.samefile(source, target):
+                continue
+            if os.path.exists(target + ".tmp"):
+                os.remove(target + ".tmp")
+            os.link(source, target + ".tmp")
+            os.replace(target + ".tmp", target)
+    except OSError:
+        return False
+    return True
 
-    print("\nCompleted. json and csv files in subdirectory: {}".format(sub_directory))
 
 def create_filename(link, title_str):
     # Create variables. Use the suffix of the link make a filename:
@@ -72,14 +514,10 @@ def create_filename(link, title_str):
     lsl = link_str.split("-")
     #print(lsl)  # ['windows', '11', '24h2', 'supported', 'intel', 'processors']
 
-    # One entry with no nnHn and no Intel/AMD: windows-11-supported-processors
+    # One entry per vendor with no nnHn: windows-11-supported-intel-processors
     # Change Windows 11 to Windows 11 21h1.
     if len(lsl) < 6:
-        if "intel" in lsl:
-            filename = "{}-{}-21h1-intel".format(lsl[0], lsl[1],)
-
-        else: # "amd" in lsl:
-            filename = "{}-{}-21h1-amd".format(lsl[0], lsl[1],)
+        filename = "{}-{}-21h1-{}".format(lsl[0], lsl[1], get_vendor(lsl))
 
     # Normal entry:
     else:
@@ -96,32 +534,198 @@ def create_filename(link, title_str):
     return filename, directory
 
 
-def dump_to_json(data_dict, directory, filename):
-    # Dump the data_dict as a .json file in the sub-directory
-    with open(directory + filename + ".json", 'w') as fout:
-        fout.write(json.dumps(data_dict, indent = 4))
+def dump_to_csv(cpu_table, directory, filename):
+    # Dump the cpu_table as a csv file. One row of Model, Manufacturer, Brand for each CPU.
+    #print(cpu_table.row(1)) # ('x7211E', 'Intel', 'Atom')
 
+    # Use csv to write the rows to sub-directory csv file
+    with open(directory + filename + ".csv.tmp", 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerows(cpu_table.rows())
+    os.replace(directory + filename + ".csv.tmp", directory + filename + ".csv")
+
+
+sqlite_schema = """
+CREATE TABLE IF NOT EXISTS release (
+    release TEXT NOT NULL,
+    vendor TEXT NOT NULL,
+    doc_date TEXT NOT NULL,
+    PRIMARY KEY (release, vendor)
+);
+CREATE TABLE IF NOT EXISTS cpu (
+    release TEXT NOT NULL,
+    vendor TEXT NOT NULL,
+    model TEXT NOT NULL,
+    manufacturer TEXT NOT NULL,
+    brand TEXT NOT NULL,
+    PRIMARY KEY (release, vendor, model)
+);
+CREATE INDEX IF NOT EXISTS cpu_model ON cpu (model);
+CREATE INDEX IF NOT EXISTS cpu_brand ON cpu (brand);
+CREATE INDEX IF NOT EXISTS cpu_release ON cpu (release, vendor);
+"""
 
-def dump_to_csv(data_dict, directory, filename):
-    # Dump the data_dict as a csv file. CSV expects a list of lists
-    csv_list = []
-    for key, value in data_dict.items():
-        temp_list = []
-        #print(key, value) # x7211E {'Manufacturer': 'Intel', 'Brand': 'Atom'}
-        temp_list.append(key)
-        for sub_key, sub_value in value.items():
-            #print(sub_value)
-            temp_list.append(sub_value)
-        #print(temp_list)
-        csv_list.append(temp_list)
 
-    # Use csv to write list to sub-directory csv file
-    with open(directory + filename + ".csv", 'w', newline='') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerows(csv_list)
+def dump_to_sqlite(table_list, database):
+    """
+    Write the tables of this run to the SQLite database in one transaction.
+    table_list is a list of (full_filename, cpu_table). E.g.
+    From: windows-11-24h2-intel-2025-02-28
+    Get:  release windows_11_24h2, vendor intel, doc_date 2025-02-28
+    The rows of each release and vendor are replaced. The header row is not stored.
+    """
+    connection = sqlite3.connect(database)
+    with connection:
+        connection.executescript(sqlite_schema)
+        for full_filename, cpu_table in table_list:
+            fl = full_filename.split("-")
+            release = "_".join(fl[0:3])
+            vendor = fl[3]
+            doc_date = "-".join(fl[4:])
+            connection.execute("DELETE FROM cpu WHERE release = ? AND vendor = ?", (release, vendor))
+            connection.execute("INSERT OR REPLACE INTO release VALUES (?, ?, ?)",
+                (release, vendor, doc_date))
+            connection.executemany("INSERT OR REPLACE INTO cpu VALUES (?, ?, ?, ?, ?)",
+                ((release, vendor, model, manufacturer, brand)
+                    for model, manufacturer, brand in cpu_table.cpu_rows()))
+    connection.close()
+
+
+def get_page(link, session=None, cache_entry={}, offline=False, rate_limiter=None,
+        retries=retries_default, timeout=timeout_default):
+    """
+    Get the Microsoft webpage as html text.
+    The html is shared by get_date() and get_dict(), so each page is only
+    downloaded once.
+
+    A conditional GET is made with the ETag and Last-Modified of the cached copy.
+    Returns the html and the new cache entry for the link:
+    (html, entry)  The webpage was downloaded, or read from the cache.
+    (None, entry)  Not modified (304) and the .json and .csv files still exist.
+    (None, None)   Offline and there is no cached copy of the webpage.
+    Raises requests.RequestException if the webpage could not be downloaded.
+    Without a session, one is made for the webpage.
+    """
+    with stats.stage("fetch", link) as record:
+        cache_file = get_cache_filename(link)
+        cache_entry = dict(cache_entry)
+
+        if offline:
+            if not os.path.exists(cache_file):
+                return None, None
+            with open(cache_file, 'rb') as fin:
+                content = fin.read()
+            record["bytes_read"] = len(content)
+            return decode_html(content), cache_entry
+
+        headers = {}
+        if os.path.exists(cache_file):
+            if "etag" in cache_entry:
+                headers["If-None-Match"] = cache_entry["etag"]
+            if "last_modified" in cache_entry:
+                headers["If-Modified-Since"] = cache_entry["last_modified"]
+
+        if session is None:
+            session = get_session(1)
+        response = get_response(session, link, headers, rate_limiter, retries, timeout, record)
+        #print(response.status_code)
+
+        if response.status_code == 304:
+            if tables_exist(cache_entry.get("filename")):
+                return None, cache_entry
+            # The files have been removed from the sub-directory. Use the cached copy.
+            with open(cache_file, 'rb') as fin:
+                content = fin.read()
+            record["bytes_read"] = len(content)
+        else:
+            content = response.content
+            os.makedirs(cache_directory, exist_ok=True)
+            with open(cache_file, 'wb') as fout:
+                fout.write(content)
+            cache_entry = {}
+            if "ETag" in response.headers:
+                cache_entry["etag"] = response.headers["ETag"]
+            if "Last-Modified" in response.headers:
+                cache_entry["last_modified"] = response.headers["Last-Modified"]
+
+        return decode_html(content), cache_entry
+
+
+def get_response(session, link, headers={}, rate_limiter=None, retries=retries_default,
+        timeout=timeout_default, record=None):
+    """
+    GET the link. Timeouts, connection errors and the statuses in retry_status_set
+    are tried again up to retries times, after a random wait up to
+    backoff_base * 2**try seconds. Raises requests.RequestException if the last
+    try fails, or the status is an error that is not tried again. E.g. 404
+    If a stats record is given, the retries, the status of the last response and
+    the bytes of all the responses are added to it, also when an error is raised.
+    """
+    import requests
+
+    for attempt in range(retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        try:
+            response = session.get(link, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        else:
+            if record is not None:
+                record["http_status"] = response.status_code
+                record["bytes_downloaded"] = record.get("bytes_downloaded", 0) + len(response.content)
+            if response.status_code not in retry_status_set or attempt == retries:
+                response.raise_for_status()
+                return response
+        if record is not None:
+            record["retries"] = attempt + 1
+        time.sleep(random.uniform(0, min(backoff_max, backoff_base * 2 ** attempt)))
+
+
+def decode_html(content):
+    # The Microsoft webpages are utf-8.
+    return content.decode("utf-8", errors="replace")
+
+
+def get_cache_filename(link):
+    # The cached webpage is named from the suffix of the link. E.g.
+    # html_cache/windows-11-24h2-supported-intel-processors.html
+    return cache_directory + "/" + link.split("/").pop() + ".html"
+
+
+def tables_exist(filename):
+    # Check the table and .csv files from the last run are in the sub-directory.
+    if not filename:
+        return False
+    path = sub_directory + "/" + filename
+    return win_cpu_serial.find_table(path) is not None and os.path.exists(path + ".csv")
+
+
+def load_previous_table(filename):
+    # Load the table of the last run, in any format.
+    return win_cpu_serial.load_table(win_cpu_serial.find_table(sub_directory + "/" + filename))
 
 
-def get_date(link):
+def load_cache_index():
+    """
+    Load the ETag, Last-Modified and output filename of each cached webpage:
+    {'https://learn.microsoft.com/...': {'etag': '"0x8DC..."', 'last_modified': '...',
+    'filename': 'windows-11-24h2-intel-2025-02-28'}, ...}
+    """
+    if not os.path.exists(cache_index_file):
+        return {}
+    with open(cache_index_file) as fin:
+        return json.load(fin)
+
+
+def save_cache_index(cache_index):
+    os.makedirs(cache_directory, exist_ok=True)
+    with open(cache_index_file, 'w') as fout:
+        fout.write(json.dumps(cache_index, indent = 4))
+
+
+def get_date(html):
     """
     Get the date of the document from the webpage. HTML is like this:
 
@@ -135,58 +739,123 @@ def get_date(link):
         >
             2024-03-01
     </local-time>
+
+    The metadata is at the top of the page, so stop reading once it is found.
     """
-    response = requests.get(link)
-    soup = BeautifulSoup(response.content, 'html.parser')
-    for i in soup.find_all("ul", {"class": "metadata page-metadata"}):
-        date_str = i.getText()
-        date_str = date_str.strip()
-    return date_str
+    parser = CpuPageParser()
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        if parser.date_found:
+            break
+    return parser.date_str.strip()
 
 
-def get_dict(link):
+def get_dict(html, record=None):
     """
-    Get supported CPU's webpage from Microsoft.
-    The returned html has a table with 3 or 4 columns in each row.
-    Get the data from the relevant columns into a list.
-    Build a dictionary from the list data like this:
+    Use the supported CPU's webpage from Microsoft.
+    The html has a table with 3 or 4 columns in each row.
+    Get the data from the relevant columns of each row.
+    Build a CpuTable from the row data, read like this dictionary:
     {'x7211E': {'Manufacturer': 'Intel', 'Brand': 'Atom'}, 'x7213E': {'Manufacturer': ...}}
+    If a stats record is given, the rows parsed and dropped are added to it.
+    Dropped rows have less than 3 cells, or repeat a CPU model already in the dictionary.
     """
-    data_dict = {}
-
-    response = requests.get(link)
-    #print(response.status_code)
-    #print(response.content)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    cpu_table = CpuTable()
 
-    counter = 0
-    for i in soup.find_all('tr'):
-        counter +=1
-        # Table Row <tr> has newline delimited Table Data <td>.
-        tr_str = i.getText()
+    parser = CpuPageParser()
+    rows_parsed = 0
+    for manufacturer, brand, model in iter_cpu_rows(html, parser):
+        rows_parsed += 1
+        # Add row data to the table with CPU model number as the key.
+        cpu_table.add(model, manufacturer, brand)
 
-        # Remove Tradmarks, footnotes, etc. from Table Row string.
-        tr_str = ("").join(tr_str.split("®"))
-        tr_str = ("").join(tr_str.split("™"))
-        tr_str = ("").join(tr_str.split("[1]"))
-        tr_str = ("").join(tr_str.split("[2]"))
+    if record is not None:
+        record["rows_parsed"] = rows_parsed
+        record["rows_dropped"] = parser.rows_dropped + rows_parsed - len(cpu_table)
 
-        # Make a list of Table Data. <td>
-        td_list = tr_str.split("\n")
+    return cpu_table
 
-        # Cut down the td_list. 0 and then above 3, to get relevant table data <td>.
-        td_list.pop(0)
-        while len(td_list) > 3:
-            td_list.pop()
 
-        #print(counter, td_list)
+def iter_cpu_rows(html, parser=None):
+    """
+    Yield (manufacturer, brand, model) tuples from the table rows of the webpage.
+    The html is fed to the parser in chunks and the rows are yielded as soon as
+    their closing </tr> is read. No document tree is built.
+    The header row (Manufacturer, Brand, Model) is yielded like any other row.
+    """
+    if parser is None:
+        parser = CpuPageParser()
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        yield from parser.take_rows()
+    parser.close()
+    yield from parser.take_rows()
 
-        # Add tr_list data to dictionary with CPU model number as the key.
-        data_dict[td_list[2]] = {"Manufacturer":td_list[0], "Brand":td_list[1],}
 
-    # Take off 1 for the header row.
-    print("Entries in dictionary:", len(data_dict)-1)
-    return data_dict
+class CpuPageParser(HTMLParser):
+    """
+    Event driven parser for the Microsoft supported CPU webpages.
+    Collects the text of the <ul class="metadata page-metadata"> as date_str,
+    and the text of the first 3 cells of each table row. Rows with less than
+    3 cells are dropped.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.date_str = ""
+        self.date_found = False
+        self.metadata_depth = 0
+        self.rows = []
+        self.rows_dropped = 0
+        self.cells = None
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "ul":
+            if self.metadata_depth:
+                self.metadata_depth += 1
+            elif dict(attrs).get("class") == "metadata page-metadata":
+                self.metadata_depth = 1
+        elif tag == "tr":
+            self.cells = []
+        elif tag in ("td", "th") and self.cells is not None:
+            self.end_cell()
+            self.cell = []
+
+    def handle_endtag(self, tag):
+        if tag == "ul" and self.metadata_depth:
+            self.metadata_depth -= 1
+            if not self.metadata_depth:
+                self.date_found = True
+        elif tag in ("td", "th"):
+            self.end_cell()
+        elif tag == "tr" and self.cells is not None:
+            self.end_cell()
+            if len(self.cells) >= 3:
+                self.rows.append(tuple(self.cells[:3]))
+            else:
+                self.rows_dropped += 1
+            self.cells = None
+
+    def handle_data(self, data):
+        if self.metadata_depth:
+            self.date_str += data
+        if self.cell is not None:
+            self.cell.append(data)
+
+    def end_cell(self):
+        if self.cell is None:
+            return
+        cell_str = "".join(self.cell)
+        # Remove Tradmarks, footnotes, etc. from Table Data string.
+        for mark in ("®", "™", "[1]", "[2]"):
+            cell_str = ("").join(cell_str.split(mark))
+        self.cells.append(" ".join(cell_str.split()))
+        self.cell = None
+
+    def take_rows(self):
+        rows = self.rows
+        self.rows = []
+        return rows
 
 
 
@@ -222,6 +891,42 @@ link_list = [
 ['Windows 11 24H2 - Intel processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-11-24h2-supported-intel-processors'],
 ]
 
+# Used with --qualcomm
+link_list_qualcomm = [
+['Windows 10 2004 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-2004-supported-qualcomm-processors'],
+['Windows 10 20H2 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-20h2-supported-qualcomm-processors'],
+['Windows 10 21H1 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-21h1-supported-qualcomm-processors'],
+['Windows 10 21H2 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-21h2-supported-qualcomm-processors'],
+['Windows 10 22H2 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-22h2-supported-qualcomm-processors'],
+['Windows 11 21H1 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-11-supported-qualcomm-processors'],
+['Windows 11 22H2/23H2 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-11-22h2-supported-qualcomm-processors'],
+['Windows 11 24H2 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-11-24h2-supported-qualcomm-processors'],
+]
+
+# Used with --before-2020. The Qualcomm links are only used with --qualcomm as well.
+# The releases before 1709 are not included.
+link_list_before_2020 = [
+['Windows 10 1709 - AMD processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1709-supported-amd-processors'],
+['Windows 10 1709 - Intel processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1709-supported-intel-processors'],
+['Windows 10 1709 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1709-supported-qualcomm-processors'],
+
+['Windows 10 1803 - AMD processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1803-supported-amd-processors'],
+['Windows 10 1803 - Intel processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1803-supported-intel-processors'],
+['Windows 10 1803 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1803-supported-qualcomm-processors'],
+
+['Windows 10 1809 - AMD processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1809-supported-amd-processors'],
+['Windows 10 1809 - Intel processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1809-supported-intel-processors'],
+['Windows 10 1809 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1809-supported-qualcomm-processors'],
+
+['Windows 10 1903 - AMD processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1903-supported-amd-processors'],
+['Windows 10 1903 - Intel processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1903-supported-intel-processors'],
+['Windows 10 1903 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1903-supported-qualcomm-processors'],
+
+['Windows 10 1909 - AMD processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1909-supported-amd-processors'],
+['Windows 10 1909 - Intel processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1909-supported-intel-processors'],
+['Windows 10 1909 - Qualcomm processors', 'https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/windows-10-1909-supported-qualcomm-processors'],
+]
+
 if __name__=="__main__":
 
     main()
@@ -6,179 +6,435 @@
 # Compare with supported CPU's in most recent release of Win 11
 # Generate a list of CPU hardware no longer supported in the last 5 years.
 #
+# The size, modification time and sha256 of each .json file, its CPU models and
+# the unsupported CPU's of each release are kept in unsupported_cache.json.
+# On the next run only new or changed .json files are loaded and compared again.
+# Use --rebuild to ignore the cache.
+#
+# Use --sqlite win_cpu.db to read the tables from the database written by
+# get_win_tables.py --sqlite win_cpu.db instead of the .json files.
+#
+# Use --stats stats.json to save the time, bytes and rows of each file and stage.
+#
+# Each vendor in win_cpu_vendors.py is loaded and compared in its own worker process.
+# Use -w 1 to use one worker process.
+#
+# The unsupported CPU's are written from memory to each sink in one pass:
+# console   Print the CPU's.
+# json      master_unsupported_intel.json, master_unsupported_amd.json, ...
+# csv       master_unsupported_intel.csv, master_unsupported_amd.csv, ...
+# markdown  unsupported_cpu_intel.md, unsupported_cpu_amd.md, ...
+# Default: --sink console json markdown
+#
 # Ian Stewart 2025-08-05 CC0
 
 import os
 import sys
+import argparse
+import contextlib
+import csv
+import hashlib
+import io
 import json
 import glob
+import re
+import sqlite3
+from multiprocessing import Pool
+
+import win_cpu_serial
+from win_cpu_stats import stats
+from win_cpu_vendors import vendors
 
 sub_directory  = "win_cpu"
+cache_file = "unsupported_cache.json"
+# Changed when the cache is not compatible with older versions of the program.
+cache_version = 2
 
 def main():
     """
-    Get intel and amd lists of .json files from sub-directory.
+    For each vendor, in its own worker process:
+    Get the vendor's list of .json files from sub-directory.
     Create titles from the filenames. Not sure what for. Could be handy?
-    Load files into a list/array of dictionaries.
-    Last in dictionary in list is the most recent Windows release of supported CPU's.
-    Extract the key/CPU model to an array of lists
+    Load the key/CPU model of each file to an array of lists. Files that have not
+    changed since the last run are not loaded, their CPU models are in the cache.
+    Last list in the array is the most recent Windows release of supported CPU's.
     Compare the lists and build a master list of unsupported CPU's.
-    Copy master lists to master dictionaries
-    Dump master dictionary to .json file.
-    Open master .json file and dump dictionary key to console
+
+    Then print the console output of the workers in vendor order, and write the
+    master lists to each sink. E.g. .json file, .md file and console.
+    Vendors with no .json files are left out.
+    With --stats the timings and counters of each file and stage are saved.
     """
+    args = get_args()
+    if args.stats:
+        stats.enable()
+
     print("\nCreate a dictionary of CPU's not supported in the latest Windows release.")
 
-    json_intel_file_list = get_json_intel_file_list()
-    #print(json_intel_file_list)
-    json_intel_title_list = get_json_title_list(json_intel_file_list)
-    #print(json_intel_title_list)
-
-    json_amd_file_list = get_json_amd_file_list()
-    #print(json_amd_file_list)
-    json_amd_title_list = get_json_title_list(json_amd_file_list)
-    #print(json_amd_title_list)
-
-    # Intel. Load the json files into and array of dictionaries
-    dict_array_intel = get_array_of_dictionaries(json_intel_file_list, json_intel_title_list)
-    # AMD
-    dict_array_amd = get_array_of_dictionaries(json_amd_file_list, json_amd_title_list)
-
-    # Intel. Make an array of the supported CPU model numbers
-    cpu_list_array_intel = make_cpu_list_array(dict_array_intel)
-    # AMD
-    cpu_list_array_amd = make_cpu_list_array(dict_array_amd)
-
-    # Intel. Add unsupported CPU's to a master list.
-    cpu_unsupported_intel_list = cpus_unsupported(cpu_list_array_intel, json_intel_title_list)
-    print("\nTotal Unsupported Intel CPU's:    {:>4}".format(len(cpu_unsupported_intel_list)))
-    # AMD
-    cpu_unsupported_amd_list = cpus_unsupported(cpu_list_array_amd, json_amd_title_list)
-    print("\nTotal Unsupported AMD CPU's:      {:>4}".format(len(cpu_unsupported_amd_list)))
-
-    # Intel. Convert list to dict and save master as json file.
-    dump_master_dict_intel_to_json(cpu_unsupported_intel_list)
-    # AMD.
-    dump_master_dict_amd_to_json(cpu_unsupported_amd_list)
-
-    # Intel Load unsupported CPU master file and dump to console
-    print("\nIntel CPU's not supported by latest Windows: {}".format(len(cpu_unsupported_intel_list)))
-    with open("master_unsupported_intel.json") as fin:
-        temp_dict = json.load(fin)
-        for key, value in temp_dict.items():
-            print(key)
-            pass
-
-    # AMD Load unsupported CPU master file and dump to console
-    print("\nAMD CPU's not supported by latest Windows: {}".format(len(cpu_unsupported_amd_list)))
-    with open("master_unsupported_amd.json") as fin:
-        temp_dict = json.load(fin)
-        for key, value in temp_dict.items():
-            print(key)
-            pass
-
-
-def dump_master_dict_intel_to_json(cpu_unsupported_intel_list):
+    # The database has no files to cache.
+    if args.sqlite:
+        cache = None
+    else:
+        cache = {} if args.rebuild else load_cache()
+
+    job_list = [(vendor, cache, args.sqlite) for vendor in vendors]
+    with Pool(min(args.workers, len(job_list)), initializer=init_worker,
+            initargs=(stats.enabled,)) as pool:
+        result_list = pool.starmap(run_vendor, job_list)
+    result_list = [result for result in result_list if result["title_list"]]
+
+    # Same order as one process: the loads of each vendor, then the compares.
+    for result in result_list:
+        print(result["load_output"], end="")
+    for result in result_list:
+        print(result["diff_output"], end="")
+    for result in result_list:
+        for record in result["records"]:
+            stats.add(record)
+
+    if cache is not None:
+        json_file_list = []
+        for result in result_list:
+            for key in ("manifest", "keys", "unsupported"):
+                cache.setdefault(key, {}).update(result["cache"].get(key, {}))
+            json_file_list += result["file_list"]
+        save_cache(cache, json_file_list)
+
+    # Write the master lists to the files and console.
+    sink_list = [sink_types[name]() for name in args.sink]
+    for result in result_list:
+        for sink in sink_list:
+            sink.write(vendors[result["vendor"]], result["unsupported_list"])
+
+    if args.stats:
+        stats.dump(args.stats)
+        print("\nStats written to: {}".format(args.stats))
+
+
+def init_worker(stats_enabled):
+    # The stats of each worker process are sent back to the main process.
+    stats.enabled = stats_enabled
+    stats.hooks = []
+
+
+def run_vendor(vendor, cache, sqlite_file=None):
+    """
+    Load the CPU models of each release of the vendor and get the unsupported CPU's.
+    Runs in a worker process. The console output, the new cache entries and the
+    stats are returned to the main process:
+    {'vendor': 'intel', 'title_list': [...], 'file_list': [...],
+     'unsupported_list': ['3205U', ...], 'load_output': '...', 'diff_output': '...',
+     'cache': {...}, 'records': [...]}
+    """
+    stats.records = []
+    result = {"vendor": vendor, "title_list": [], "file_list": [], "unsupported_list": [],
+        "load_output": "", "diff_output": "", "cache": cache, "records": stats.records}
+
+    if sqlite_file:
+        connection = sqlite3.connect(sqlite_file)
+        with contextlib.redirect_stdout(io.StringIO()) as fout:
+            cpu_list_array, title_list, digest_list = get_cpu_list_array_sqlite(connection, vendor)
+        connection.close()
+    else:
+        file_list = get_json_file_list(vendor)
+        title_list = get_json_title_list(file_list)
+        if not file_list:
+            return result
+        # Make an array of the supported CPU model numbers
+        with contextlib.redirect_stdout(io.StringIO()) as fout:
+            cpu_list_array, digest_list = get_cpu_list_array(file_list, title_list, cache)
+        result["file_list"] = file_list
+    if not title_list:
+        return result
+    result["title_list"] = title_list
+    result["load_output"] = fout.getvalue()
+
+    # Add unsupported CPU's to a master list.
+    with contextlib.redirect_stdout(io.StringIO()) as fout:
+        with stats.stage("diff", vendor) as record:
+            unsupported_list = cpus_unsupported(cpu_list_array, title_list, digest_list, cache)
+            record["unsupported"] = len(unsupported_list)
+        print("\n{:<34}{:>4}".format("Total Unsupported {} CPU's:".format(vendors[vendor]),
+            len(unsupported_list)))
+    result["unsupported_list"] = unsupported_list
+    result["diff_output"] = fout.getvalue()
+    return result
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description="Create the lists of CPU's not supported in the latest Windows release.")
+    parser.add_argument("--rebuild", action="store_true",
+        help="Ignore {} and load and compare all the .json files.".format(cache_file))
+    parser.add_argument("--sqlite", metavar="DATABASE", default=None,
+        help="Read the tables from this SQLite database instead of the .json files.")
+    parser.add_argument("--stats", metavar="FILE", default=None,
+        help="Save the time, bytes and rows of each file and stage to this .json file.")
+    parser.add_argument("--sink", nargs="+", choices=list(sink_types),
+        default=["json", "markdown", "console"],
+        help="Where to write the unsupported CPU's. Default: console json markdown")
+    parser.add_argument("-w", "--workers", type=int, default=len(vendors),
+        help="Number of vendors to process at the same time. Default: {}".format(len(vendors)))
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be 1 or more")
+    return args
+
+
+class ConsoleSink:
     """
-    Convert unsupported Intel list to dictionary
-    Write the dictionary out to .json file.
+    Print the unsupported CPU's of a manufacturer.
     """
-    master_unsupported_intel_dict = {}
-    for item in cpu_unsupported_intel_list:
-        master_unsupported_intel_dict[item] = {"Manufacturer": "Intel"}
-    # Dump the data_dict as a .json file in the sub-directory
-    with open("master_unsupported_intel.json", 'w') as fout:
-        fout.write(json.dumps(master_unsupported_intel_dict, indent = 4))
+    def write(self, manufacturer, cpu_list):
+        print("\n{} CPU's not supported by latest Windows: {}".format(manufacturer, len(cpu_list)))
+        for item in cpu_list:
+            print(item)
 
 
-def dump_master_dict_amd_to_json(cpu_unsupported_amd_list, ):
+class FileSink:
     """
-    Convert unsupported AMD list to dictionary
-    Write the dictionary out to .json file.
+    Write the unsupported CPU's of a manufacturer to a file. E.g.
+    filename_format "master_unsupported_{}.json" gives master_unsupported_intel.json
     """
-    master_unsupported_amd_dict = {}
-    for item in cpu_unsupported_amd_list:
-        master_unsupported_amd_dict[item] = {"Manufacturer": "AMD"}
-    # Dump the data_dict as a .json file in the sub-directory
-    with open("master_unsupported_amd.json", 'w') as fout:
-        fout.write(json.dumps(master_unsupported_amd_dict, indent = 4))
+    filename_format = None
+    newline = None
+
+    def write(self, manufacturer, cpu_list):
+        filename = self.filename_format.format(manufacturer.lower())
+        with stats.stage("write", filename) as record:
+            with open(filename, 'w', newline=self.newline) as fout:
+                self.dump(fout, manufacturer, cpu_list)
+            record["output_bytes"] = os.path.getsize(filename)
+
+
+class JsonSink(FileSink):
+    # {'3205U': {'Manufacturer': 'Intel'}, ...}
+    filename_format = "master_unsupported_{}.json"
+
+    def dump(self, fout, manufacturer, cpu_list):
+        master_unsupported_dict = {}
+        for item in cpu_list:
+            master_unsupported_dict[item] = {"Manufacturer": manufacturer}
+        fout.write(json.dumps(master_unsupported_dict, indent = 4))
+
+
+class CsvSink(FileSink):
+    # 3205U,Intel
+    filename_format = "master_unsupported_{}.csv"
+    newline = ''
+
+    def dump(self, fout, manufacturer, cpu_list):
+        writer = csv.writer(fout)
+        for item in cpu_list:
+            writer.writerow([item, manufacturer])
+
+
+class MarkdownSink(FileSink):
+    # The lists linked from README.md
+    filename_format = "unsupported_cpu_{}.md"
+
+    def dump(self, fout, manufacturer, cpu_list):
+        fout.write("## {} CPU's not supported by latest Windows: {}\n".format(
+            manufacturer, len(cpu_list)))
+        fout.write("```\n")
+        for item in cpu_list:
+            fout.write(item + "\n")
+        fout.write("```\n")
 
 
-def cpus_unsupported(cpu_list_array, cpu_title_list):
+sink_types = {"console": ConsoleSink, "json": JsonSink, "csv": CsvSink, "markdown": MarkdownSink}
+
+
+def cpus_unsupported(cpu_list_array, cpu_title_list, digest_list=None, cache=None):
     """
     In the cpu_list_array the last item in the list is the latest Win 11 release.
     The CPU's in preceeding releases are checked to see if they are in the most recent release.
-    If the CPU's are not supported they are added to the master_unsupported_list
+    If the CPU's are not supported they are added to the master_unsupported_set
+    The latest release and the master are sets, so each CPU is checked in constant time.
+    With the digest_list from get_cpu_list_array() and the cache, the unsupported CPU's
+    of a release are only computed again if the release or the latest release changed.
+    A table repeated in several releases has the same digest. It is only compared
+    once, and only added to the master set once.
     """
-    master_unsupported_cpu_list = []
+    if not cpu_list_array:
+        return []
+    latest_cpu_set = None
+    unsupported_cache = {} if cache is None else cache.setdefault("unsupported", {})
+    unsupported_sets = {}
+    master_unsupported_cpu_set = set()
     diff_now = 0
     diff_prev = 0
     total_added = 0
     for index in range(len(cpu_list_array)):
-        temp_list = []
-
         print("\n{}: {}".format(cpu_title_list[index], index))
         print("Number of CPU's in list:          {:>4}".format(len(cpu_list_array[index])))
 
-        for item in cpu_list_array[index]:
-            if item not in cpu_list_array[len(cpu_list_array)-1]:
-                temp_list.append(item)
-        print("Number of unsupported CPU's:      {:>4}".format(len(temp_list)))
-
-        # From the temp_list, add the CPU's to the master_list, if not already in master_list
-        for item in temp_list:
-            if item not in master_unsupported_cpu_list:
-                master_unsupported_cpu_list.append(item)
-        print("Master list unsupported CPU's:    {:>4}".format(len(master_unsupported_cpu_list)))
+        if digest_list is None:
+            diff_key = index
+        else:
+            # Cache key is the digest of the release and the digest of the latest release.
+            diff_key = digest_list[index] + ":" + digest_list[len(digest_list)-1]
+        repeated = diff_key in unsupported_sets
+        if not repeated:
+            if diff_key not in unsupported_cache:
+                if latest_cpu_set is None:
+                    latest_cpu_set = set(cpu_list_array[len(cpu_list_array)-1])
+                unsupported_cache[diff_key] = sorted(set(cpu_list_array[index]) - latest_cpu_set)
+            unsupported_sets[diff_key] = set(unsupported_cache[diff_key])
+        temp_set = unsupported_sets[diff_key]
+        print("Number of unsupported CPU's:      {:>4}".format(len(temp_set)))
+
+        # Add the CPU's to the master set. Those already in the master set are ignored.
+        if not repeated:
+            master_unsupported_cpu_set |= temp_set
+        print("Master list unsupported CPU's:    {:>4}".format(len(master_unsupported_cpu_set)))
 
         # Calculate how many unsupported CPU's added to the Master list.
-        diff_now = len(master_unsupported_cpu_list)
+        diff_now = len(master_unsupported_cpu_set)
         total_added = diff_now - diff_prev
         print("Total CPU's added to Master list: {:>4}".format(total_added))
         diff_prev = diff_now
 
-    return sorted(master_unsupported_cpu_list)
+    return sorted(master_unsupported_cpu_set)
 
 
-def make_cpu_list_array(dict_array):
+def get_cpu_list_array(json_file_list, json_title_list, cache):
     """
-    From the array of dictionaries, use the keys to make an array list of the CPU models.
+    Make an array of the CPU models in each json file, and a list of the sha256
+    digest of each file. A file is only loaded if it is new or has changed.
+    Only the CPU models are loaded, without the header row.
+    cache is like this:
+    {'manifest': {'win_cpu/windows-11-24h2-intel-2025-02-28.json':
+        {'size': 52731, 'mtime_ns': 1754300000000000000, 'sha256': '9f86...'}, ...},
+     'keys': {'9f86...': ['x7211E', ...], ...},
+     'unsupported': {'<digest of release>:<digest of latest>': ['3205U', ...], ...}}
     """
+    manifest = cache.setdefault("manifest", {})
+    keys_cache = cache.setdefault("keys", {})
     cpu_list_array = []
-    for a_dict in dict_array:
-        temp_list = []
-        for key, value in a_dict.items():
-            temp_list.append(key)
-        cpu_list_array.append(temp_list)
-    return cpu_list_array
-
-
-def get_array_of_dictionaries(json_file_list, json_title_list):
+    digest_list = []
+    print("\nTotal of CPU models in each dictionary...")
+    for index, filename in enumerate(json_file_list):
+        with stats.stage("load", filename) as record:
+            stat = os.stat(filename)
+            entry = manifest.get(filename, {})
+            record["bytes_read"] = 0
+            if (entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns
+                    or entry.get("sha256") not in keys_cache):
+                # New or changed file. Hash it and load it if the content is new.
+                with open(filename, 'rb') as fin:
+                    content = fin.read()
+                record["bytes_read"] = len(content)
+                digest = hashlib.sha256(content).hexdigest()
+                if digest not in keys_cache:
+                    # Only the CPU models are decoded, without the header row.
+                    keys_cache[digest] = win_cpu_serial.loads_keys(content, filename)
+                entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+                manifest[filename] = entry
+
+            cpu_list = keys_cache[entry["sha256"]]
+            record["rows_parsed"] = len(cpu_list)
+
+        cpu_list_array.append(cpu_list)
+        digest_list.append(entry["sha256"])
+        print("{}: {:>4}".format(json_title_list[index], len(cpu_list)))
+    print("Total dictionaries:", len(cpu_list_array))
+    return cpu_list_array, digest_list
+
+
+def get_cpu_list_array_sqlite(connection, vendor):
     """
-    Load the intel or amd json files into an array/list of dictionaries
+    Make an array of the CPU models of each release of the vendor from the
+    SQLite database, the list of titles, E.g. windows_11_24h2_intel, and the list
+    of the sha256 of the CPU models of each release, for cpus_unsupported().
+    The releases are in release order, the last is the most recent Windows release.
     """
-    dict_array = []
+    release_list = [row[0] for row in connection.execute(
+        "SELECT release FROM release WHERE vendor = ?", (vendor,))]
+    release_list.sort(key=release_sort_key)
+
+    cpu_list_array = []
+    title_list = []
+    digest_list = []
     print("\nTotal of CPU models in each dictionary...")
-    for index, filename in enumerate(json_file_list):
-        with open(filename) as fin:
-            temp_dict = json.load(fin)
-            dict_array.append(temp_dict)
-            print("{}: {:>4}".format(json_title_list[index], len(temp_dict)-1 ))
-    print("Total dictionaries:", len(dict_array))
-    return dict_array
+    for release in release_list:
+        cpu_list = [row[0] for row in connection.execute(
+            "SELECT model FROM cpu WHERE release = ? AND vendor = ? ORDER BY rowid",
+            (release, vendor))]
+        cpu_list_array.append(cpu_list)
+        digest_list.append(hashlib.sha256("\n".join(cpu_list).encode("utf-8")).hexdigest())
+        title_list.append(release + "_" + vendor)
+        print("{}: {:>4}".format(title_list[len(title_list)-1], len(cpu_list)))
+    print("Total dictionaries:", len(cpu_list_array))
+    return cpu_list_array, title_list, digest_list
+
+
+def release_sort_key(name):
+    """
+    Sort key for the release of a title or filename, oldest release first. E.g.
+    From: windows_10_2004_intel or win_cpu/windows-10-2004-intel-2021-11-10.json
+    Get:  (10, 20, 1)  Windows 10, 2020, first half of year.
+    Version yymm is the same as yyh1 up to June, and yyh2 after.
+    """
+    tl = re.split("[-_]", name.split("/").pop())
+    major = float(tl[1]) if re.fullmatch(r"\d+(\.\d+)?", tl[1]) else 0.0
+    version = tl[2]
+    if re.fullmatch(r"\d\dh\d", version):
+        return (major, int(version[0:2]), int(version[3]))
+    if re.fullmatch(r"\d{4}", version):
+        return (major, int(version[0:2]), 1 if int(version[2:4]) <= 6 else 2)
+    return (major, 0, 0)
+
+
+def load_cache():
+    if not os.path.exists(cache_file):
+        return {}
+    with open(cache_file) as fin:
+        cache = json.load(fin)
+    if cache.get("version") != cache_version:
+        return {}
+    return cache
+
+
+def save_cache(cache, json_file_list):
+    """
+    Save the cache, without the entries for files that are no longer in the
+    sub-directory.
+    """
+    manifest = {}
+    for filename in json_file_list:
+        manifest[filename] = cache["manifest"][filename]
+    digest_set = {entry["sha256"] for entry in manifest.values()}
 
+    keys_cache = {}
+    for digest in digest_set:
+        keys_cache[digest] = cache["keys"][digest]
 
-def get_json_intel_file_list():
+    unsupported_cache = {}
+    for diff_key, cpu_list in cache.get("unsupported", {}).items():
+        digest, latest_digest = diff_key.split(":")
+        if digest in digest_set and latest_digest in digest_set:
+            unsupported_cache[diff_key] = cpu_list
+
+    with open(cache_file, 'w') as fout:
+        fout.write(json.dumps({"version": cache_version, "manifest": manifest, "keys": keys_cache,
+            "unsupported": unsupported_cache}))
+
+
+def get_json_file_list(vendor):
     """
-    Use glob to search for the intel json files in sub directory.
+    Use glob to search for the json files of the vendor in sub directory. E.g. intel
+    Tables written in another format by get_win_tables.py --format are included,
+    E.g. .msgpack files. See win_cpu_serial.py
     Needs to be sorted to ensure the last entry is the most recent Win release.
+    Sorted by release, then by filename.
     """
-    json_intel_file_list = sorted(glob.glob(sub_directory + "/*intel*.json"))
-    return json_intel_file_list
-
-def get_json_amd_file_list():
-    json_amd_list = sorted(glob.glob(sub_directory + "/*amd*.json"))
-    return json_amd_list
+    json_file_list = []
+    for extension in win_cpu_serial.table_extensions:
+        json_file_list += glob.glob(sub_directory + "/*-{}-*{}".format(vendor, extension))
+    json_file_list.sort()
+    json_file_list.sort(key=release_sort_key)
+    return json_file_list
 
 def get_json_title_list(json_file_list):
     """
@@ -232,49 +488,49 @@ windows_11_24h2_amd:  335
 Total dictionaries: 8
 
 windows_10_2004_intel: 0
-Number of CPU's in list:           882
+Number of CPU's in list:           881
 Number of unsupported CPU's:       533
 Master list unsupported CPU's:     533
 Total CPU's added to Master list:  533
 
 windows_10_20h2_intel: 1
-Number of CPU's in list:           919
+Number of CPU's in list:           918
 Number of unsupported CPU's:       570
 Master list unsupported CPU's:     570
 Total CPU's added to Master list:   37
 
 windows_10_21h1_intel: 2
-Number of CPU's in list:           943
+Number of CPU's in list:           942
 Number of unsupported CPU's:       594
 Master list unsupported CPU's:     594
 Total CPU's added to Master list:   24
 
 windows_10_21h2_intel: 3
-Number of CPU's in list:           993
+Number of CPU's in list:           992
 Number of unsupported CPU's:       591
 Master list unsupported CPU's:     605
 Total CPU's added to Master list:   11
 
 windows_10_22h2_intel: 4
-Number of CPU's in list:          1023
+Number of CPU's in list:          1022
 Number of unsupported CPU's:       456
 Master list unsupported CPU's:     607
 Total CPU's added to Master list:    2
 
 windows_11_21h1_intel: 5
-Number of CPU's in list:           904
+Number of CPU's in list:           903
 Number of unsupported CPU's:       299
 Master list unsupported CPU's:     655
 Total CPU's added to Master list:   48
 
 windows_11_22h2_intel: 6
-Number of CPU's in list:           910
+Number of CPU's in list:           909
 Number of unsupported CPU's:       302
 Master list unsupported CPU's:     673
 Total CPU's added to Master list:   18
 
 windows_11_24h2_intel: 7
-Number of CPU's in list:           782
+Number of CPU's in list:           781
 Number of unsupported CPU's:         0
 Master list unsupported CPU's:     673
 Total CPU's added to Master list:    0
@@ -282,49 +538,49 @@ Total CPU's added to Master list:    0
 Total Unsupported Intel CPU's:     673
 
 windows_10_2004_amd: 0
-Number of CPU's in list:           349
+Number of CPU's in list:           348
 Number of unsupported CPU's:       230
 Master list unsupported CPU's:     230
 Total CPU's added to Master list:  230
 
 windows_10_20h2_amd: 1
-Number of CPU's in list:           349
+Number of CPU's in list:           348
 Number of unsupported CPU's:       230
 Master list unsupported CPU's:     230
 Total CPU's added to Master list:    0
 
 windows_10_21h1_amd: 2
-Number of CPU's in list:           349
+Number of CPU's in list:           348
 Number of unsupported CPU's:       230
 Master list unsupported CPU's:     230
 Total CPU's added to Master list:    0
 
 windows_10_21h2_amd: 3
-Number of CPU's in list:           378
+Number of CPU's in list:           377
 Number of unsupported CPU's:       214
 Master list unsupported CPU's:     230
 Total CPU's added to Master list:    0
 
 windows_10_22h2_amd: 4
-Number of CPU's in list:           461
+Number of CPU's in list:           460
 Number of unsupported CPU's:       220
 Master list unsupported CPU's:     236
 Total CPU's added to Master list:    6
 
 windows_11_21h1_amd: 5
-Number of CPU's in list:           284
+Number of CPU's in list:           283
 Number of unsupported CPU's:         0
 Master list unsupported CPU's:     236
 Total CPU's added to Master list:    0
 
 windows_11_22h2_amd: 6
-Number of CPU's in list:           320
+Number of CPU's in list:           319
 Number of unsupported CPU's:         0
 Master list unsupported CPU's:     236
 Total CPU's added to Master list:    0
 
 windows_11_24h2_amd: 7
-Number of CPU's in list:           336
+Number of CPU's in list:           335
 Number of unsupported CPU's:         0
 Master list unsupported CPU's:     236
 Total CPU's added to Master list:    0
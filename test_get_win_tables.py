@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+#
+# test_get_win_tables.py
+#
+# Write tables with write_tables() in a temporary win_cpu/, as get_win_tables.py
+# does, and check that a table the same as one already written is hard linked.
+# $ python3 -m pytest -q   or   $ python3 -m unittest test_get_win_tables
+
+import contextlib
+import glob
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import get_win_tables
+
+base_link = "https://learn.microsoft.com/en-us/windows-hardware/design/minimum/supported/"
+rows = [("AMD", "Ryzen 5", "3600X"), ("AMD", "Ryzen 7", "5800X"), ("AMD", "Athlon", "3000G")]
+
+
+def make_page(date_str, row_list=rows):
+    # A webpage like those of Microsoft, with the document date and the CPU table.
+    body = "".join("<tr>\n<td>{}®</td>\n<td>{}®</td>\n<td>{}</td>\n</tr>\n".format(*row)
+        for row in row_list)
+    return ('<html><body><ul class="metadata page-metadata" data-bi-name="page info">\n'
+        '<li class="visibility-hidden-visual-diff">\n<local-time format="twoDigitNumeric" '
+        'datetime="{0}T11:55:00.000Z">\n{0}\n</local-time>\n</li>\n</ul>\n'
+        '<table>\n<thead>\n<tr>\n<th>Manufacturer</th>\n<th>Brand</th>\n<th>Model</th>\n</tr>\n'
+        '</thead>\n<tbody>\n{1}</tbody></table></body></html>').format(date_str, body)
+
+
+class TestWriteTables(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.sub_directory = get_win_tables.sub_directory
+        get_win_tables.sub_directory = os.path.join(self.directory, "win_cpu")
+        self.table_files = {}
+        self.cache_index = {}
+
+    def tearDown(self):
+        get_win_tables.sub_directory = self.sub_directory
+        shutil.rmtree(self.directory)
+
+    def write(self, title_str, link_name, html):
+        # Write the tables, and keep their sha256 as main() does.
+        link = base_link + link_name
+        with contextlib.redirect_stdout(io.StringIO()):
+            full_filename, cpu_table, digest = get_win_tables.write_tables(title_str, link, html,
+                self.table_files)
+        self.cache_index[link] = {"filename": full_filename, "sha256": digest}
+        self.table_files.setdefault(digest, full_filename)
+        return full_filename
+
+    def path(self, full_filename):
+        return os.path.join(get_win_tables.sub_directory, full_filename)
+
+    def assertLinked(self, first, second):
+        for extension in (".json", ".csv"):
+            self.assertTrue(os.path.samefile(self.path(first) + extension,
+                self.path(second) + extension), second + extension)
+
+    def assertNoTemporaryFiles(self):
+        self.assertEqual(glob.glob(os.path.join(get_win_tables.sub_directory, "*.tmp")), [])
+
+    def assertDigests(self):
+        # The sha256 kept for each link is that of its table file.
+        for entry in self.cache_index.values():
+            with open(self.path(entry["filename"]) + ".json", 'rb') as fin:
+                self.assertEqual(hashlib.sha256(fin.read()).hexdigest(), entry["sha256"])
+
+    def test_same_tables(self):
+        # Windows 10 2004 and 20H2 AMD have the same table.
+        first = self.write("Windows 10 2004 - AMD processors",
+            "windows-10-2004-supported-amd-processors", make_page("2021-11-10"))
+        second = self.write("Windows 10 20H2 - AMD processors",
+            "windows-10-20h2-supported-amd-processors", make_page("2021-11-12"))
+        self.assertEqual(second, "windows-10-20h2-amd-2021-11-12")
+        self.assertLinked(first, second)
+        self.assertNoTemporaryFiles()
+        self.assertDigests()
+
+        # The same table again, with a new document date.
+        third = self.write("Windows 10 20H2 - AMD processors",
+            "windows-10-20h2-supported-amd-processors", make_page("2022-02-01"))
+        self.assertEqual(third, "windows-10-20h2-amd-2022-02-01")
+        self.assertLinked(first, third)
+        self.assertNoTemporaryFiles()
+        self.assertDigests()
+
+    def test_different_tables(self):
+        first = self.write("Windows 10 2004 - AMD processors",
+            "windows-10-2004-supported-amd-processors", make_page("2021-11-10"))
+        second = self.write("Windows 10 20H2 - AMD processors",
+            "windows-10-20h2-supported-amd-processors", make_page("2021-11-12", rows[:2]))
+        self.assertFalse(os.path.samefile(self.path(first) + ".json", self.path(second) + ".json"))
+        self.assertNoTemporaryFiles()
+        self.assertDigests()
+
+
+if __name__=="__main__":
+
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+#
+# test_get_win_unsupported.py
+#
+# Check that the set based cpus_unsupported() gives the same counters and
+# master list as the list based version it replaced.
+# $ python3 -m pytest -q   or   $ python3 -m unittest test_get_win_unsupported
+
+import contextlib
+import io
+import random
+import unittest
+
+import get_win_unsupported
+
+
+def cpus_unsupported_lists(cpu_list_array, cpu_title_list):
+    """
+    The list based version of cpus_unsupported(), as it was before sets were used.
+    """
+    master_unsupported_cpu_list = []
+    diff_now = 0
+    diff_prev = 0
+    total_added = 0
+    for index in range(len(cpu_list_array)):
+        temp_list = []
+
+        print("\n{}: {}".format(cpu_title_list[index], index))
+        print("Number of CPU's in list:          {:>4}".format(len(cpu_list_array[index])))
+
+        for item in cpu_list_array[index]:
+            if item not in cpu_list_array[len(cpu_list_array)-1]:
+                temp_list.append(item)
+        print("Number of unsupported CPU's:      {:>4}".format(len(temp_list)))
+
+        # From the temp_list, add the CPU's to the master_list, if not already in master_list
+        for item in temp_list:
+            if item not in master_unsupported_cpu_list:
+                master_unsupported_cpu_list.append(item)
+        print("Master list unsupported CPU's:    {:>4}".format(len(master_unsupported_cpu_list)))
+
+        # Calculate how many unsupported CPU's added to the Master list.
+        diff_now = len(master_unsupported_cpu_list)
+        total_added = diff_now - diff_prev
+        print("Total CPU's added to Master list: {:>4}".format(total_added))
+        diff_prev = diff_now
+
+    return sorted(master_unsupported_cpu_list)
+
+
+def run(function, *args):
+    # Return the result and the console output of the function.
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = function(*args)
+    return result, output.getvalue()
+
+
+def make_releases(seed, release_count=8, pool_size=400):
+    # Random releases of CPU models. Each drops some models and adds new ones.
+    # Two releases in the middle have the same table, as Windows 10 2004 to 21H1 do.
+    rng = random.Random(seed)
+    pool = ["i{}-{}{}U".format(rng.choice((3, 5, 7)), number, rng.choice("ABCDE"))
+        for number in range(1000, 1000 + pool_size)]
+    cpu_list_array = []
+    cpu_list = rng.sample(pool, pool_size // 3)
+    for index in range(release_count):
+        if index != 3:
+            cpu_list = [model for model in cpu_list if rng.random() > 0.15]
+            cpu_list += [model for model in rng.sample(pool, 40) if model not in cpu_list]
+        cpu_list_array.append(list(cpu_list))
+    title_list = ["windows_10_{}_intel".format(index) for index in range(release_count)]
+    return cpu_list_array, title_list
+
+
+class TestCpusUnsupported(unittest.TestCase):
+
+    def test_same_as_lists(self):
+        for seed in range(5):
+            cpu_list_array, title_list = make_releases(seed)
+            expected = run(cpus_unsupported_lists, cpu_list_array, title_list)
+            self.assertEqual(run(get_win_unsupported.cpus_unsupported, cpu_list_array, title_list),
+                expected)
+
+    def test_same_as_lists_with_digests(self):
+        # Tables with the same digest are only compared once, and the cache is
+        # used on the second run. The counters must not change.
+        cpu_list_array, title_list = make_releases(7)
+        digest_list = ["digest-{}".format(index) for index in range(len(cpu_list_array))]
+        digest_list[3] = digest_list[2]
+        expected = run(cpus_unsupported_lists, cpu_list_array, title_list)
+        cache = {}
+        for run_number in range(2):
+            self.assertEqual(run(get_win_unsupported.cpus_unsupported, cpu_list_array,
+                title_list, digest_list, cache), expected)
+
+    def test_latest_only(self):
+        cpu_list_array = [["i5-8250U", "i7-8550U"]]
+        title_list = ["windows_11_24h2_intel"]
+        self.assertEqual(run(get_win_unsupported.cpus_unsupported, cpu_list_array, title_list),
+            run(cpus_unsupported_lists, cpu_list_array, title_list))
+
+
+if __name__=="__main__":
+
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+#
+# test_win_cpu_match.py
+#
+# Matches of the CPU names reported by computers to the models of the lists.
+# CPU's that are not in the lists must not be matched to a near model.
+# $ python3 -m pytest -q   or   $ python3 -m unittest test_win_cpu_match
+
+import unittest
+
+from win_cpu_match import ModelMatcher
+
+models = ["i5-8250U", "i7-8700", "i5-8011", "Bronze 3104", "A9-9420", "Ryzen 5 3600X",
+    "Ryzen 5 PRO 4650G", "Ryzen 7 5800X"]
+vendors = ["Intel", "AMD"]
+vendor_codes = [0, 0, 0, 0, 1, 1, 1, 1]
+
+
+class TestModelMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = ModelMatcher(models, vendors, vendor_codes)
+
+    def assertMatch(self, name, model, kind):
+        model_ids, match_kind, score = self.matcher.match(name)
+        self.assertEqual(([models[model_id] for model_id in model_ids], match_kind),
+            ([model], kind), name)
+
+    def assertNoMatch(self, name):
+        model_ids, match_kind, score = self.matcher.match(name)
+        self.assertEqual(([models[model_id] for model_id in model_ids], match_kind), ([], None),
+            "{} score {:.2f}".format(name, score))
+
+    def test_exact(self):
+        self.assertMatch("i5-8250U", "i5-8250U", "exact")
+        self.assertMatch("Ryzen 7 5800X", "Ryzen 7 5800X", "exact")
+
+    def test_normalized(self):
+        self.assertMatch("Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz", "i5-8250U", "normalized")
+        self.assertMatch("Intel(R) Xeon(R) Bronze 3104 CPU @ 1.70GHz", "Bronze 3104", "normalized")
+        self.assertMatch("AMD Ryzen 7 5800X 8-Core Processor", "Ryzen 7 5800X", "exact")
+
+    def test_approximate(self):
+        self.assertMatch("Intel Core i5 8250U", "i5-8250U", "approximate")
+        self.assertMatch("AMD Ryzen 5 4650G PRO", "Ryzen 5 PRO 4650G", "approximate")
+
+    def test_near_misses(self):
+        # Not in the lists. A shorter or near model number is not a match.
+        self.assertNoMatch("AMD A9-9425")
+        self.assertNoMatch("Intel(R) Core(TM) i7-8700K CPU @ 3.70GHz")
+        self.assertNoMatch("AMD Ryzen 5 3600XT 6-Core Processor")
+        self.assertNoMatch("i5-80115")
+
+    def test_no_words(self):
+        self.assertNoMatch("Intel(R) CPU @ 2.00GHz")
+
+
+if __name__=="__main__":
+
+    unittest.main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+#
+# win_cpu_bench.py
+#
+# Benchmark get_win_tables.py and get_win_unsupported.py without the Microsoft website.
+#
+# Saved copies of the Microsoft webpages are kept in sub_directory bench_fixtures/
+# Record them from the html_cache/ of a previous run of get_win_tables.py:
+# $ python3 win_cpu_bench.py --record
+#
+# Each stage is timed, and its peak memory measured with tracemalloc:
+# fetch      Get the webpages from a local web server over one HTTP session.
+# parse      get_date() and get_dict() on each webpage.
+# serialize  write_tables() on each webpage, as get_win_tables.py does. It gets the
+#            date and table again, writes the table and .csv files, and hard links
+#            tables that are the same. Use --format to benchmark another format. E.g. msgpack
+# load       Load the CPU models of the table files.
+# diff       cpus_unsupported() for each vendor.
+#
+# Save the results as a baseline, then compare later runs with it:
+# $ python3 win_cpu_bench.py --save-baseline bench_baseline.json
+# $ python3 win_cpu_bench.py --compare bench_baseline.json
+# The baseline keeps its --format. It is only compared with runs of the same format.
+
+import os
+import sys
+import argparse
+import contextlib
+import glob
+import http.server
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import get_win_tables
+import get_win_unsupported
+import win_cpu_serial
+from win_cpu_vendors import vendors
+
+fixture_directory = "bench_fixtures"
+stages = ["fetch", "parse", "serialize", "load", "diff"]
+tolerance_default = 0.20
+
+
+def main():
+    args = get_args()
+
+    if args.record:
+        record_fixtures()
+        return
+
+    fixture_list = sorted(glob.glob(fixture_directory + "/*.html"))
+    if not fixture_list:
+        sys.exit("No webpages in {}/. Run with --record first.".format(fixture_directory))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fin:
+            baseline = json.load(fin)
+        # Baselines saved before --format are of the json format.
+        if baseline.get("format", "json") != args.format:
+            sys.exit("The baseline {} is of the {} format. Use --format {} to compare with it.".format(
+                args.compare, baseline.get("format", "json"), baseline.get("format", "json")))
+
+    print("\nBenchmark with {} webpages from {}/, {} format, best of {} runs.".format(
+        len(fixture_list), fixture_directory, args.format, args.repeat))
+
+    results = run_benchmark(fixture_list, args.repeat, win_cpu_serial.get_serializer(args.format))
+    results["format"] = args.format
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as fout:
+            fout.write(json.dumps(results, indent = 4))
+        print("\nBaseline saved to: {}".format(args.save_baseline))
+
+    if baseline is not None:
+        if not compare_results(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the stages of get_win_tables.py and get_win_unsupported.py offline.")
+    parser.add_argument("--record", action="store_true",
+        help="Copy the webpages from {}/ to {}/".format(get_win_tables.cache_directory, fixture_directory))
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+        help="Run each stage this many times and keep the fastest. Default: 3")
+    parser.add_argument("--save-baseline", metavar="FILE",
+        help="Save the results to this .json file.")
+    parser.add_argument("--compare", metavar="FILE",
+        help="Compare the results with this baseline .json file.")
+    parser.add_argument("--tolerance", type=float, default=tolerance_default,
+        help="Allowed slow down or memory increase. Default: {}".format(tolerance_default))
+    parser.add_argument("--format", choices=list(win_cpu_serial.serializer_types), default="json",
+        help="Format of the table files written by the serialize stage. Default: json")
+    args = parser.parse_args()
+    try:
+        win_cpu_serial.get_serializer(args.format)
+    except ValueError as error:
+        parser.error(str(error))
+    return args
+
+
+def record_fixtures():
+    """
+    Copy the cached webpages of a get_win_tables.py run to the fixture directory.
+    """
+    html_list = sorted(glob.glob(get_win_tables.cache_directory + "/*.html"))
+    if not html_list:
+        sys.exit("No webpages in {}/. Run get_win_tables.py first.".format(
+            get_win_tables.cache_directory))
+    os.makedirs(fixture_directory, exist_ok=True)
+    for filename in html_list:
+        shutil.copy(filename, fixture_directory)
+    print("\nRecorded {} webpages in: {}".format(len(html_list), fixture_directory))
+
+
+def run_benchmark(fixture_list, repeat, serializer=win_cpu_serial.PrettyJson()):
+    """
+    Run the stages in a temporary directory. Returns the fastest time in seconds
+    and the peak memory in bytes of each stage:
+    {'fetch': {'seconds': 0.21, 'peak_bytes': 1520000}, ...}
+    """
+    results = {}
+    temp_directory = tempfile.mkdtemp()
+    server = start_server(os.path.abspath(fixture_directory))
+    try:
+        get_win_tables.cache_directory = os.path.join(temp_directory, "html_cache")
+        get_win_tables.sub_directory = os.path.join(temp_directory, "win_cpu")
+        get_win_unsupported.sub_directory = get_win_tables.sub_directory
+
+        base_url = "http://127.0.0.1:{}/".format(server.server_address[1])
+        # Use the suffix of the links for the fixture names and titles.
+        titles = {link.split("/").pop(): title
+            for title, link in get_win_tables.get_link_list(True, True)}
+        page_list = []
+        for filename in fixture_list:
+            name = os.path.basename(filename)[:-len(".html")]
+            page_list.append((titles.get(name, name), "https://learn.microsoft.com/" + name,
+                base_url + name + ".html"))
+
+        session = get_win_tables.get_session(1)
+        state = {}
+
+        def fetch():
+            shutil.rmtree(get_win_tables.cache_directory, ignore_errors=True)
+            state["html"] = [get_win_tables.get_page(url, session)[0] for title, link, url in page_list]
+
+        def parse():
+            state["tables"] = [(get_win_tables.get_date(html), get_win_tables.get_dict(html))
+                for html in state["html"]]
+
+        def serialize():
+            shutil.rmtree(get_win_tables.sub_directory, ignore_errors=True)
+            # The sha256 of each table written, shared by the webpages as in main().
+            table_files = {}
+            for index, html in enumerate(state["html"]):
+                title, link, url = page_list[index]
+                full_filename, cpu_table, digest = get_win_tables.write_tables(title, link, html,
+                    table_files, serializer)
+                table_files.setdefault(digest, full_filename)
+
+        def load():
+            state["arrays"] = []
+            for vendor in vendors:
+                file_list = get_win_unsupported.get_json_file_list(vendor)
+                title_list = get_win_unsupported.get_json_title_list(file_list)
+                cpu_list_array, digest_list = get_win_unsupported.get_cpu_list_array(
+                    file_list, title_list, {})
+                state["arrays"].append((cpu_list_array, title_list))
+
+        def diff():
+            for cpu_list_array, title_list in state["arrays"]:
+                get_win_unsupported.cpus_unsupported(cpu_list_array, title_list)
+
+        functions = {"fetch": fetch, "parse": parse, "serialize": serialize,
+            "load": load, "diff": diff}
+        for stage in stages:
+            results[stage] = measure(functions[stage], repeat)
+    finally:
+        server.shutdown()
+        shutil.rmtree(temp_directory, ignore_errors=True)
+    return results
+
+
+def measure(function, repeat):
+    """
+    Fastest time of the runs, then the peak memory of one more run.
+    tracemalloc slows Python down, so it is not used in the timed runs.
+    Console output is discarded.
+    """
+    best_seconds = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for run in range(repeat):
+            start = time.perf_counter()
+            function()
+            seconds = time.perf_counter() - start
+            if best_seconds is None or seconds < best_seconds:
+                best_seconds = seconds
+
+        tracemalloc.start()
+        function()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"seconds": best_seconds, "peak_bytes": peak_bytes}
+
+
+def start_server(directory):
+    # Local web server for the fixture webpages, on a free port, in a thread.
+    class QuietHandler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def print_results(results):
+    print("\n{:<10} {:>10} {:>14}".format("Stage", "Seconds", "Peak memory"))
+    for stage in stages:
+        print("{:<10} {:>10.4f} {:>11.1f} MB".format(stage, results[stage]["seconds"],
+            results[stage]["peak_bytes"] / 1e6))
+
+
+def compare_results(results, baseline, tolerance):
+    """
+    Print the change of each stage from the baseline. Return False if any stage
+    is slower, or uses more memory, than the baseline by more than the tolerance.
+    """
+    passed = True
+    print("\nCompared with baseline (tolerance {:.0%}):".format(tolerance))
+    for stage in stages:
+        if stage not in baseline:
+            continue
+        for measure_name in ("seconds", "peak_bytes"):
+            old = baseline[stage][measure_name]
+            new = results[stage][measure_name]
+            ratio = new / old if old else 1.0
+            status = "ok"
+            if ratio > 1 + tolerance:
+                status = "REGRESSION"
+                passed = False
+            print("{:<10} {:<10} {:>+8.1%}  {}".format(stage, measure_name, ratio - 1, status))
+    return passed
+
+
+if __name__=="__main__":
+
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+#
+# win_cpu_feed.py
+#
+# The feed of changes to the Microsoft Supported CPU lists. Microsoft revises the
+# list of a release in place, with a new document date. Each time get_win_tables.py
+# gets a revised list, it is compared with the previous list of the same release
+# and vendor, and the changes are added to the end of win_cpu_feed.jsonl
+#
+# One line of compact json for each revised list:
+# {"time":"2025-03-10T04:12:00Z","release":"windows_11_24h2","vendor":"intel",
+#  "from":"2025-02-28","to":"2025-03-10","added":{"i3-N305":["Intel","Core"]},
+#  "removed":["x7211E"],"rebranded":{"i5-8250U":["Intel","Core i5"]}}
+# added and rebranded give the Manufacturer and Brand of each model. The first list
+# of a release and vendor has "from":null, and all its models are added.
+#
+# Lines are only ever added, so a program following the feed keeps the offset,
+# in bytes, where it stopped reading, and next time reads only the new lines:
+# $ python3 win_cpu_feed.py
+# $ python3 win_cpu_feed.py --offset 18344
+# $ python3 win_cpu_feed.py --offset 18344 --follow 60
+# win_cpu_server.py also returns them: http://127.0.0.1:8642/feed?offset=18344
+
+import os
+import sys
+import argparse
+import json
+import time
+
+feed_file = "win_cpu_feed.jsonl"
+
+
+def main():
+    args = get_args()
+
+    offset = args.offset
+    while True:
+        try:
+            record_list, offset = read_feed(offset, args.feed)
+        except ValueError as error:
+            sys.exit(error)
+        for record in record_list:
+            if args.json:
+                print(json.dumps(record, separators=(",", ":")))
+            else:
+                print_record(record)
+        if not args.follow:
+            break
+        sys.stdout.flush()
+        time.sleep(args.follow)
+
+    if not args.json:
+        print("\nNext offset: {}".format(offset))
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description="Print the changes to the Supported CPU lists since an offset of the feed.")
+    parser.add_argument("--feed", default=feed_file,
+        help="Feed file. Default: {}".format(feed_file))
+    parser.add_argument("--offset", type=int, default=0,
+        help="Offset in bytes to read from, as printed by the last run. Default: 0")
+    parser.add_argument("--follow", type=float, metavar="SECONDS",
+        help="Keep reading new changes, every SECONDS.")
+    parser.add_argument("--json", action="store_true",
+        help="Print each change as its line of json.")
+    return parser.parse_args()
+
+
+def print_record(record):
+    print("\n{} {} {} to {} ({})".format(record["release"], record["vendor"],
+        record["from"], record["to"], record["time"]))
+    for model, (manufacturer, brand) in record["added"].items():
+        print("  + {:<24} {} {}".format(model, manufacturer, brand))
+    for model in record["removed"]:
+        print("  - {}".format(model))
+    for model, (manufacturer, brand) in record["rebranded"].items():
+        print("  * {:<24} {} {}".format(model, manufacturer, brand))
+
+
+def split_filename(full_filename):
+    """
+    Return the release, vendor and date of a table filename. E.g.
+    From: windows-11-24h2-intel-2025-02-28
+    Get:  ('windows_11_24h2', 'intel', '2025-02-28')
+    """
+    word_list = full_filename.split("-")
+    return "_".join(word_list[:-4]), word_list[-4], "-".join(word_list[-3:])
+
+
+def make_record(full_filename, previous_filename, previous_table, cpu_table):
+    """
+    Compare the CpuTable of full_filename with the previous table of its release and
+    vendor. Return the feed record of the changes, or None if there are none.
+    previous_table is None if there is no previous table.
+    """
+    release, vendor, date_str = split_filename(full_filename)
+    added = {}
+    rebranded = {}
+    # Without the header row.
+    for model, manufacturer, brand in cpu_table.cpu_rows():
+        previous_row = previous_table.get(model) if previous_table is not None else None
+        if previous_row is None:
+            added[model] = [manufacturer, brand]
+        elif previous_row != (manufacturer, brand):
+            rebranded[model] = [manufacturer, brand]
+    removed = []
+    if previous_table is not None:
+        removed = [model for model, manufacturer, brand in previous_table.cpu_rows()
+            if model not in cpu_table]
+        if not (added or removed or rebranded):
+            return None
+
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "release": release,
+        "vendor": vendor,
+        "from": split_filename(previous_filename)[2] if previous_table is not None else None,
+        "to": date_str,
+        "added": added,
+        "removed": removed,
+        "rebranded": rebranded,
+    }
+
+
+def append_records(record_list, filename=feed_file):
+    # Add the records to the end of the feed in one write, so a reader never
+    # sees part of a run.
+    lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in record_list)
+    with open(filename, 'ab') as fout:
+        fout.write(lines.encode("utf-8"))
+
+
+def read_feed(offset=0, filename=feed_file):
+    """
+    Return the records from offset to the end of the feed, and the offset to read
+    from next time: ([{'release': 'windows_11_24h2', ...}, ...], 18344)
+    A line still being written is left for the next time.
+    Raises ValueError if offset is not the start of a line.
+    """
+    if offset < 0:
+        raise ValueError("Offset {} is less than 0".format(offset))
+    if not os.path.exists(filename):
+        if offset:
+            raise ValueError("No feed file: {}".format(filename))
+        return [], 0
+    with open(filename, 'rb') as fin:
+        if offset:
+            fin.seek(offset - 1)
+            if fin.read(1) != b"\n":
+                raise ValueError("Offset {} is not the start of a line of {}".format(
+                    offset, filename))
+        content = fin.read()
+    end = content.rfind(b"\n") + 1
+    record_list = [json.loads(line) for line in content[:end].splitlines()]
+    return record_list, offset + end
+
+
+if __name__=="__main__":
+
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+#
+# win_cpu_fleet.py
+#
+# Classify the computers of an inventory by their CPU.
+# The inventory is a .csv file with a hostname and the CPU name reported by the
+# computer in each row. E.g.
+# hostname,cpu
+# pc-0001,Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz
+#
+# Each row gets a verdict:
+# supported    The CPU is supported by the latest Windows release.
+# unsupported  The CPU was supported by an earlier release, but not the latest.
+# unknown      The CPU is not in any of the Microsoft lists.
+#
+# The verdicts are written to fleet_verdicts.csv, and the counts of each verdict
+# per manufacturer, brand and release to fleet_summary.json
+#
+# The inventory is read in chunks of lines. The chunks are parsed, classified and
+# written as .csv text by a pool of worker processes, each with its own copy of the
+# index built by win_cpu_index.py. A row must not have a newline inside a quoted field.
+#
+# $ python3 win_cpu_fleet.py inventory.csv
+
+import os
+import sys
+import argparse
+import csv
+import io
+import json
+from multiprocessing import Pool
+
+import win_cpu_index
+import win_cpu_match
+
+chunk_bytes = 1024 * 1024
+
+# Set in each worker process by init_worker()
+worker_index = None
+worker_matcher = None
+worker_verdicts = {}
+
+
+def main():
+    """
+    Read the inventory in chunks of lines. Classify the chunks in the worker processes.
+    Write the verdicts in the order of the inventory, and add up the counts.
+    """
+    args = get_args()
+
+    if not os.path.exists(args.index):
+        sys.exit("No index file: {}. Run win_cpu_index.py first.".format(args.index))
+
+    print("\nClassify the computers in: {}".format(args.inventory))
+
+    summary = {"Total": 0, "Verdict": {}, "Manufacturer": {}, "Brand": {}, "Release": {}}
+    with open(args.inventory, newline='') as fin, \
+            open(args.output, 'w', newline='') as fout, \
+            Pool(args.workers, initializer=init_worker, initargs=(args.index,)) as pool:
+        if not args.no_header:
+            fin.readline()
+        writer = csv.writer(fout)
+        writer.writerow(["hostname", "cpu", "verdict", "manufacturer", "brand", "model", "match"])
+
+        # imap() returns the chunks in the order they were read.
+        for verdict_text, chunk_summary in pool.imap(classify_chunk, read_chunks(fin, args.chunk)):
+            fout.write(verdict_text)
+            add_summary(summary, chunk_summary)
+
+    with open(args.summary, 'w') as fout:
+        fout.write(json.dumps(summary, indent = 4))
+
+    print("Computers: {}".format(summary["Total"]))
+    for verdict, count in sorted(summary["Verdict"].items()):
+        print("{:<12} {:>8}".format(verdict, count))
+    print("\nVerdicts written to: {}".format(args.output))
+    print("Summary written to: {}".format(args.summary))
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description="Classify the computers of an inventory .csv file by their CPU.")
+    parser.add_argument("inventory",
+        help="Inventory .csv file. First column the hostname, second the CPU name.")
+    parser.add_argument("--no-header", action="store_true",
+        help="The inventory has no header row.")
+    parser.add_argument("-o", "--output", default="fleet_verdicts.csv",
+        help="Verdicts .csv file. Default: fleet_verdicts.csv")
+    parser.add_argument("-s", "--summary", default="fleet_summary.json",
+        help="Summary .json file. Default: fleet_summary.json")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+        help="Number of worker processes. Default: number of CPU's")
+    parser.add_argument("--chunk", type=int, default=chunk_bytes,
+        help="Approximate bytes in each chunk. Default: {}".format(chunk_bytes))
+    parser.add_argument("--index", default=win_cpu_index.index_file,
+        help="Index file. Default: {}".format(win_cpu_index.index_file))
+    args = parser.parse_args()
+    if args.workers < 1 or args.chunk < 1:
+        parser.error("--workers and --chunk must be 1 or more")
+    return args
+
+
+def read_chunks(fin, size):
+    # Yield lists of whole lines of about size bytes.
+    while True:
+        lines = fin.readlines(size)
+        if not lines:
+            return
+        yield lines
+
+
+def init_worker(index_filename):
+    # Each worker process maps the index file and builds its own matcher.
+    global worker_index, worker_matcher
+    worker_index = win_cpu_index.load_index(index_filename)
+    worker_matcher = win_cpu_match.ModelMatcher(
+        worker_index.models, worker_index.vendors, worker_index.vendor_codes)
+
+
+def classify_chunk(chunk):
+    """
+    Classify each hostname, cpu row of the chunk of lines. Returns the verdict
+    rows as .csv text and the counts for the chunk.
+    """
+    fout = io.StringIO()
+    writer = csv.writer(fout)
+    summary = {"Total": 0, "Verdict": {}, "Manufacturer": {}, "Brand": {}, "Release": {}}
+    for row in csv.reader(chunk):
+        if not row:
+            continue
+        hostname = row[0]
+        cpu = row[1] if len(row) > 1 else ""
+        verdict = classify(cpu)
+        writer.writerow([hostname, cpu] + list(verdict[0:5]))
+        summary["Total"] += 1
+        count(summary["Verdict"], verdict[0])
+        count(summary["Manufacturer"], verdict[1], verdict[0])
+        count(summary["Brand"], verdict[2], verdict[0])
+        for release in verdict[5]:
+            count(summary["Release"], release, "supported")
+    return fout.getvalue(), summary
+
+
+def classify(cpu):
+    """
+    Return (verdict, manufacturer, brand, model, match, releases) for a CPU name.
+    The same CPU names are repeated many times in an inventory, so the verdict
+    of each name is kept for the rest of the run.
+    """
+    if cpu in worker_verdicts:
+        return worker_verdicts[cpu]
+
+    model_ids, kind, score = worker_matcher.match(cpu)
+    if not model_ids:
+        verdict = ("unknown", "", "", "", "", ())
+    else:
+        model_id = model_ids[0]
+        mask = worker_index.masks[model_id]
+        releases = tuple(release for bit, release in enumerate(worker_index.releases)
+            if mask >> bit & 1)
+        unsupported = worker_index.flags[model_id] & win_cpu_index.flag_unsupported
+        verdict = ("unsupported" if unsupported else "supported",
+            worker_index.vendors[worker_index.vendor_codes[model_id]],
+            worker_index.brands[worker_index.brand_codes[model_id]],
+            worker_index.models[model_id], kind, releases)
+
+    worker_verdicts[cpu] = verdict
+    return verdict
+
+
+def count(counts, key, verdict=None):
+    # Count a key, or the verdict of a key: {'Intel': {'supported': 3, 'unsupported': 1}}
+    if verdict is None:
+        counts[key] = counts.get(key, 0) + 1
+    elif key:
+        key_counts = counts.setdefault(key, {})
+        key_counts[verdict] = key_counts.get(verdict, 0) + 1
+
+
+def add_summary(summary, chunk_summary):
+    summary["Total"] += chunk_summary["Total"]
+    for verdict, number in chunk_summary["Verdict"].items():
+        summary["Verdict"][verdict] = summary["Verdict"].get(verdict, 0) + number
+    for group in ("Manufacturer", "Brand", "Release"):
+        for key, key_counts in chunk_summary[group].items():
+            total_counts = summary[group].setdefault(key, {})
+            for verdict, number in key_counts.items():
+                total_counts[verdict] = total_counts.get(verdict, 0) + number
+
+
+if __name__=="__main__":
+
+    main()
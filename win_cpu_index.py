@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+#
+# win_cpu_index.py
+#
+# Build a compact index of which Windows releases support each CPU model.
+# Run after get_win_unsupported.py. Reads the .json files in sub_directory win_cpu/
+# and writes win_cpu_index.bin
+#
+# Each CPU model gets an integer ID. For each model the index holds a bitmask of the
+# releases that support it. Bit 0 is the oldest release, E.g. windows_10_2004, and the
+# highest bit is the latest release, E.g. windows_11_24h2.
+# Microsoft revises the list of a release with a new date, and the older files stay
+# in win_cpu/. Only the newest file of each release and vendor is used.
+#
+# Questions are answered with bitwise operations on the masks. E.g.
+# Supported in 22H2 but dropped in 24H2:
+# $ python3 win_cpu_index.py --present windows_10_22h2 --absent windows_11_24h2
+# Supported in every release:
+# $ python3 win_cpu_index.py --every
+#
+# The file can be memory-mapped. Layout, all little-endian:
+#   header:  magic, number of releases, vendors, brands, models, masks offset, strings offset
+#   masks:   one unsigned 64 bit mask per model
+#   brands:  one unsigned 16 bit number per model. Index into the brand names.
+#   vendors: one byte per model. Index into the vendor names.
+#   flags:   one byte per model. Bit 0 set if not supported in the vendor's latest release.
+#   strings: release, vendor, brand and model names. utf-8, newline separated.
+
+import os
+import sys
+import argparse
+import mmap
+import struct
+
+index_file = "win_cpu_index.bin"
+magic = b"WINCPUX2"
+# Header is 32 bytes, so the 64 bit masks that follow are aligned.
+header_format = "<8sIIIIII"
+header_size = struct.calcsize(header_format)
+flag_unsupported = 1
+
+
+def main():
+    """
+    Without options build the index from the .json files in sub-directory.
+    With --present, --absent or --every, query the index and list the CPU models.
+    """
+    args = get_args()
+
+    if not (args.present or args.absent or args.every):
+        print("\nBuild the index of supported releases for each CPU model.")
+        build_index()
+        return
+
+    cpu_index = load_index()
+    present = list(cpu_index.releases) if args.every else args.present
+    for name in present + args.absent:
+        if name not in cpu_index.releases:
+            sys.exit("Release not in index: {}. Releases: {}".format(
+                name, ", ".join(cpu_index.releases)))
+    if args.vendor and cpu_index.vendor_code(args.vendor) is None:
+        sys.exit("Vendor not in index: {}. Vendors: {}".format(
+            args.vendor, ", ".join(cpu_index.vendors)))
+
+    model_list = cpu_index.select(present, args.absent, args.vendor)
+    for model_id in model_list:
+        print("{:<10} {}".format(cpu_index.vendors[cpu_index.vendor_codes[model_id]],
+            cpu_index.models[model_id]))
+    print("\nTotal CPU's: {}".format(len(model_list)))
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description="Build or query the index of Windows releases supporting each CPU model.")
+    parser.add_argument("--present", nargs="+", default=[], metavar="RELEASE",
+        help="List models supported in all of these releases. E.g. windows_10_22h2")
+    parser.add_argument("--absent", nargs="+", default=[], metavar="RELEASE",
+        help="List models not supported in any of these releases. E.g. windows_11_24h2")
+    parser.add_argument("--every", action="store_true",
+        help="List models supported in every release.")
+    parser.add_argument("--vendor", default=None,
+        help="Only list models of this vendor. E.g. intel")
+    return parser.parse_args()
+
+
+def build_index(filename=index_file):
+    """
+    Load the supported CPU's of each vendor and release and write the index file.
+    """
+    # Imported here, so win_cpu_lookup.py only loads what it needs to read the index.
+    import get_win_unsupported
+    import win_cpu_serial
+    import win_cpu_vendors
+
+    vendor_file_lists = [(title, get_win_unsupported.get_json_file_list(vendor))
+        for vendor, title in win_cpu_vendors.vendors.items()]
+
+    # Releases are named from the title without the vendor. E.g. windows_11_24h2
+    release_set = set()
+    for vendor, file_list in vendor_file_lists:
+        for title in get_win_unsupported.get_json_title_list(file_list):
+            release_set.add(get_release_name(title))
+    releases = sorted(release_set, key=get_win_unsupported.release_sort_key)
+    if len(releases) > 64:
+        sys.exit("Too many releases for a 64 bit mask: {}".format(len(releases)))
+
+    vendors = []
+    brands = []
+    brand_codes_by_name = {}
+    models = []
+    masks = []
+    brand_codes = []
+    vendor_codes = []
+    flags = []
+    for vendor, file_list in vendor_file_lists:
+        if not file_list:
+            continue
+        vendor_code = len(vendors)
+        vendors.append(vendor)
+        file_list = get_newest_files(file_list)
+        title_list = get_win_unsupported.get_json_title_list(file_list)
+
+        # Dense IDs, in order of first appearance for this vendor.
+        model_ids = {}
+        for index, json_file in enumerate(file_list):
+            bit = 1 << releases.index(get_release_name(title_list[index]))
+            cpu_table = win_cpu_serial.load_table(json_file)
+            # Without the table header row.
+            for model, manufacturer, brand in cpu_table.cpu_rows():
+                if model not in model_ids:
+                    model_ids[model] = len(models)
+                    models.append(model)
+                    masks.append(0)
+                    brand_codes.append(0)
+                    vendor_codes.append(vendor_code)
+                    flags.append(0)
+                masks[model_ids[model]] |= bit
+                # The brand of the most recent release is kept.
+                if brand not in brand_codes_by_name:
+                    brand_codes_by_name[brand] = len(brands)
+                    brands.append(brand)
+                brand_codes[model_ids[model]] = brand_codes_by_name[brand]
+
+        # The last file loaded is the vendor's latest release. As in cpus_unsupported(),
+        # the CPU's not in it are unsupported.
+        latest_cpu_set = {model for model, manufacturer, brand
+            in cpu_table.cpu_rows()}
+        for model, model_id in model_ids.items():
+            if model not in latest_cpu_set:
+                flags[model_id] |= flag_unsupported
+
+    write_index(filename, releases, vendors, brands, models, masks, brand_codes, vendor_codes, flags)
+    print("Releases: {}".format(len(releases)))
+    print("CPU models: {}".format(len(models)))
+    print("Index written to: {} ({} bytes)".format(filename, os.path.getsize(filename)))
+
+
+def get_newest_files(file_list):
+    """
+    Return the newest file of each release, from a list sorted by release, then
+    by filename. E.g.
+    From: ['win_cpu/windows-11-24h2-intel-2024-10-01.json',
+           'win_cpu/windows-11-24h2-intel-2025-02-28.json']
+    Get:  ['win_cpu/windows-11-24h2-intel-2025-02-28.json']
+    """
+    import get_win_unsupported
+    newest_files = {}
+    for title, filename in zip(get_win_unsupported.get_json_title_list(file_list), file_list):
+        newest_files[title] = filename
+    return list(newest_files.values())
+
+
+def get_release_name(title):
+    # From: windows_11_24h2_intel  Get: windows_11_24h2
+    return title.rsplit("_", 1)[0]
+
+
+def write_index(filename, releases, vendors, brands, models, masks, brand_codes, vendor_codes, flags):
+    model_count = len(models)
+    masks_offset = header_size
+    strings_offset = masks_offset + 12 * model_count
+    strings = "\n".join(releases + vendors + brands + models).encode("utf-8")
+
+    with open(filename, 'wb') as fout:
+        fout.write(struct.pack(header_format, magic, len(releases), len(vendors),
+            len(brands), model_count, masks_offset, strings_offset))
+        fout.write(struct.pack("<{}Q".format(model_count), *masks))
+        fout.write(struct.pack("<{}H".format(model_count), *brand_codes))
+        fout.write(bytes(vendor_codes))
+        fout.write(bytes(flags))
+        fout.write(strings)
+
+
+def load_index(filename=index_file):
+    with open(filename, 'rb') as fin:
+        buffer = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+    return CpuIndex(buffer)
+
+
+class CpuIndex:
+    """
+    Read only view of the index file. The masks, brand and vendor codes and flags
+    are memoryviews on the mapped file, so they are not copied when loaded.
+    """
+    def __init__(self, buffer):
+        (file_magic, release_count, vendor_count, brand_count, model_count,
+            masks_offset, strings_offset) = struct.unpack_from(header_format, buffer)
+        if file_magic != magic:
+            raise ValueError("Not a CPU index file, or built by an older win_cpu_index.py")
+        view = memoryview(buffer)
+        brands_offset = masks_offset + 8 * model_count
+        vendors_offset = brands_offset + 2 * model_count
+        self.masks = view[masks_offset:brands_offset].cast("Q")
+        self.brand_codes = view[brands_offset:vendors_offset].cast("H")
+        self.vendor_codes = view[vendors_offset:vendors_offset + model_count]
+        self.flags = view[vendors_offset + model_count:strings_offset]
+
+        strings = bytes(view[strings_offset:]).decode("utf-8")
+        names = strings.split("\n") if strings else []
+        self.releases = names[:release_count]
+        self.vendors = names[release_count:release_count + vendor_count]
+        brands_end = release_count + vendor_count + brand_count
+        self.brands = names[release_count + vendor_count:brands_end]
+        self.models = names[brands_end:]
+        self.model_ids = None
+        self.matcher = None
+
+    def find(self, model):
+        """
+        Return the IDs of a model string. Usually one ID, but the same model
+        string may be listed by more than one vendor.
+        """
+        return self.get_model_ids().get(model, [])
+
+    def get_model_ids(self):
+        """
+        Return the IDs of each model string: {'i5-8250U': [1234], ...}
+        Built the first time it is needed. The dictionary is only assigned once it
+        is complete, so a thread never sees part of it.
+        """
+        if self.model_ids is None:
+            model_ids = {}
+            for model_id, name in enumerate(self.models):
+                model_ids.setdefault(name, []).append(model_id)
+            self.model_ids = model_ids
+        return self.model_ids
+
+    def vendor_code(self, vendor):
+        # Vendor names are matched without case. E.g. intel or Intel
+        for code, name in enumerate(self.vendors):
+            if name.lower() == vendor.lower():
+                return code
+        return None
+
+    def release_mask(self, release_list):
+        mask = 0
+        for name in release_list:
+            mask |= 1 << self.releases.index(name)
+        return mask
+
+    def select(self, present=[], absent=[], vendor=None):
+        """
+        Return the IDs of the models supported in all the present releases
+        and in none of the absent releases.
+        """
+        present_mask = self.release_mask(present)
+        absent_mask = self.release_mask(absent)
+        vendor_code = self.vendor_code(vendor) if vendor else None
+        model_list = []
+        for model_id, mask in enumerate(self.masks):
+            if mask & present_mask != present_mask or mask & absent_mask:
+                continue
+            if vendor_code is not None and self.vendor_codes[model_id] != vendor_code:
+                continue
+            model_list.append(model_id)
+        return model_list
+
+
+if __name__=="__main__":
+
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+#
+# win_cpu_lookup.py
+#
+# Look up CPU models in the index built by win_cpu_index.py
+# For each model show the Windows releases that support it, and whether it is
+# in the list of CPU's not supported by the latest Windows release.
+#
+# $ python3 win_cpu_lookup.py "i5-8250U" "Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz"
+# $ python3 win_cpu_lookup.py --json < model_list.txt
+#
+# The index is memory-mapped, so a lookup does not load the .json files in win_cpu/
+# Names that are not a model number are matched with win_cpu_match.py
+
+import sys
+import argparse
+import json
+
+import win_cpu_index
+import win_cpu_match
+
+
+def main():
+    """
+    Get the models from the command line, or one per line from stdin.
+    Look up each model and print the result.
+    """
+    args = get_args()
+
+    model_list = args.models
+    if not model_list:
+        model_list = [line.strip() for line in sys.stdin if line.strip()]
+
+    try:
+        cpu_index = win_cpu_index.load_index(args.index)
+    except FileNotFoundError:
+        sys.exit("No index file: {}. Run win_cpu_index.py first.".format(args.index))
+
+    result_list = lookup(model_list, cpu_index)
+
+    if args.json:
+        print(json.dumps(result_list, indent = 4))
+        return
+
+    for result in result_list:
+        print_result(result)
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description="Look up the Windows releases that support CPU models.")
+    parser.add_argument("models", nargs="*",
+        help="CPU model numbers. E.g. i5-8250U. If none, read one per line from stdin.")
+    parser.add_argument("--json", action="store_true",
+        help="Print the results as json.")
+    parser.add_argument("--index", default=win_cpu_index.index_file,
+        help="Index file. Default: {}".format(win_cpu_index.index_file))
+    return parser.parse_args()
+
+
+def lookup(model_list, cpu_index=None, match=None):
+    """
+    Look up one model string or a list of model strings. Returns a list with a
+    dictionary for each model and vendor found, or one with "Found": False:
+    [{'Model': 'i5-8250U', 'Found': True, 'Key': 'i5-8250U', 'Match': 'exact',
+      'Manufacturer': 'Intel', 'Brand': 'Core', 'Unsupported': False,
+      'Releases': {'windows_10_2004': True, ..., 'windows_11_24h2': True}}, ...]
+    Key is the model in the Microsoft list. Match is "exact" if the string is the
+    Key, otherwise how win_cpu_match matched it: "normalized" or "approximate".
+    match is the function used when the string is not a Key. E.g. a cached one.
+    Default: the ModelMatcher of the index.
+    """
+    if cpu_index is None:
+        cpu_index = win_cpu_index.load_index()
+    if isinstance(model_list, str):
+        model_list = [model_list]
+
+    result_list = []
+    for model in model_list:
+        model_ids = cpu_index.find(model)
+        kind = "exact"
+        if not model_ids:
+            model_ids, kind, score = (match or get_matcher(cpu_index).match)(model)
+        if not model_ids:
+            result_list.append({"Model": model, "Found": False})
+        for model_id in model_ids:
+            mask = cpu_index.masks[model_id]
+            releases = {}
+            for bit, release in enumerate(cpu_index.releases):
+                releases[release] = bool(mask >> bit & 1)
+            result_list.append({
+                "Model": model,
+                "Found": True,
+                "Key": cpu_index.models[model_id],
+                "Match": kind,
+                "Manufacturer": cpu_index.vendors[cpu_index.vendor_codes[model_id]],
+                "Brand": cpu_index.brands[cpu_index.brand_codes[model_id]],
+                "Unsupported": bool(cpu_index.flags[model_id] & win_cpu_index.flag_unsupported),
+                "Releases": releases,
+            })
+    return result_list
+
+
+def get_matcher(cpu_index):
+    # Build the matcher for the index the first time it is needed.
+    if cpu_index.matcher is None:
+        cpu_index.matcher = win_cpu_match.ModelMatcher(
+            cpu_index.models, cpu_index.vendors, cpu_index.vendor_codes)
+    return cpu_index.matcher
+
+
+def print_result(result):
+    print("\n" + result["Model"])
+    if not result["Found"]:
+        print("Not found in any release.")
+        return
+    if result["Match"] != "exact":
+        print("Matched ({}): {}".format(result["Match"], result["Key"]))
+    print("Manufacturer: {}".format(result["Manufacturer"]))
+    print("Brand: {}".format(result["Brand"]))
+    for release, supported in result["Releases"].items():
+        print("{:<18} {}".format(release, "supported" if supported else "-"))
+    if result["Unsupported"]:
+        print("Not supported by latest Windows.")
+    else:
+        print("Supported by latest Windows.")
+
+
+if __name__=="__main__":
+
+    main()
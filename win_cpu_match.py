@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+#
+# win_cpu_match.py
+#
+# Match the CPU name reported by a computer to a CPU model in the Microsoft lists.
+#
+# The model numbers in win_cpu/ are the table cells, E.g. "i5-8250U", "Bronze 3104".
+# Computers report names like: "Intel(R) Xeon(R) Bronze 3104 CPU @ 1.70GHz"
+#
+# normalize_model() removes the trademarks, vendor names, frequency, etc.
+# ModelMatcher then finds the longest model whose words appear together in the name.
+# If there is none, a trigram index gives the closest model by shared trigrams,
+# if its model number is in the name. So "i7-8700K" is not matched to "i7-8700".
+#
+# $ python3 win_cpu_match.py "Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz"
+
+import re
+import sys
+
+import win_cpu_index
+
+# Words that are not part of a model number.
+noise_words = {"intel", "amd", "qualcomm", "genuine", "cpu", "processor", "apu", "mobile",
+    "(r)", "(tm)"}
+vendor_words = {"intel": "Intel", "amd": "AMD", "qualcomm": "Qualcomm"}
+
+noise_re = re.compile(r"\(r\)|\(tm\)|®|™|\[\d\]")
+frequency_re = re.compile(r"@.*$|\b\d+(\.\d+)?\s*[gm]hz\b")
+core_count_re = re.compile(r"\b\w+-core\b")
+graphics_re = re.compile(r"\bwith radeon\b.*\bgraphics\b|\bw/ radeon\b.*\bgraphics\b")
+
+approximate_threshold = 0.7
+
+
+def main():
+    cpu_index = win_cpu_index.load_index()
+    matcher = ModelMatcher(cpu_index.models, cpu_index.vendors, cpu_index.vendor_codes)
+    for name in sys.argv[1:]:
+        model_ids, kind, score = matcher.match(name)
+        print("\n" + name)
+        print("Normalized: {}".format(" ".join(normalize_model(name))))
+        if not model_ids:
+            print("No match.")
+        for model_id in model_ids:
+            print("{} match: {} {} (score {:.2f})".format(kind.capitalize(),
+                cpu_index.vendors[cpu_index.vendor_codes[model_id]],
+                cpu_index.models[model_id], score))
+
+
+def normalize_model(name):
+    """
+    Return a tuple of lower case words with the noise removed. E.g.
+    From: Intel(R) Xeon(R) Bronze 3104 CPU @ 1.70GHz
+    Get:  ('xeon', 'bronze', '3104')
+    """
+    name = name.lower()
+    name = noise_re.sub(" ", name)
+    name = frequency_re.sub(" ", name)
+    name = core_count_re.sub(" ", name)
+    name = graphics_re.sub(" ", name)
+    name = name.replace(",", " ")
+    return tuple(word for word in name.split() if word not in noise_words)
+
+
+def get_trigrams(words):
+    # Trigrams of the words joined by a space and padded at each end.
+    # A hyphen is a space, so "i5 8250u" has the trigrams of "i5-8250u".
+    text = " {} ".format(" ".join(words).replace("-", " "))
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ModelMatcher:
+    """
+    Precomputed lookup tables for a list of model strings:
+    key_ids:   normalized words of a model -> list of model IDs
+    postings:  trigram -> list of normalized model keys containing it
+    Model IDs are the positions in the model list, the same as the CpuIndex IDs.
+    """
+    def __init__(self, models, vendors=None, vendor_codes=None):
+        self.vendors = vendors or []
+        self.vendor_codes = vendor_codes
+        self.key_ids = {}
+        for model_id, model in enumerate(models):
+            key = normalize_model(model)
+            if key:
+                self.key_ids.setdefault(key, []).append(model_id)
+        self.longest_key = max((len(key) for key in self.key_ids), default=0)
+
+        self.key_trigram_count = {}
+        self.postings = {}
+        for key in self.key_ids:
+            trigrams = get_trigrams(key)
+            self.key_trigram_count[key] = len(trigrams)
+            for trigram in trigrams:
+                self.postings.setdefault(trigram, []).append(key)
+
+    def match(self, name):
+        """
+        Return (model_ids, kind, score) for the best model.
+        kind is "exact", "normalized" or "approximate". ([], None, 0.0) if no match.
+        """
+        words = normalize_model(name)
+        if not words:
+            return [], None, 0.0
+
+        # Longest run of words that is a model. E.g. ('bronze', '3104') in
+        # ('xeon', 'bronze', '3104') is longer, so better, than ('3104',)
+        for length in range(min(len(words), self.longest_key), 0, -1):
+            for start in range(len(words) - length + 1):
+                key = words[start:start + length]
+                if key in self.key_ids:
+                    kind = "exact" if len(key) == len(words) else "normalized"
+                    return self.prefer_vendor(self.key_ids[key], name), kind, 1.0
+
+        return self.match_approximate(words, name)
+
+    def match_approximate(self, words, name):
+        """
+        Score each model sharing a trigram with the name by the Dice coefficient
+        of their trigrams: 2 * shared / (model trigrams + name trigrams). So words
+        in the name that are not in the model lower the score too. Only the models
+        in the postings of the name's trigrams, whose model number is a word of the
+        name, are scored.
+        """
+        trigrams = get_trigrams(words)
+        shared = {}
+        for trigram in trigrams:
+            for key in self.postings.get(trigram, ()):
+                shared[key] = shared.get(key, 0) + 1
+
+        # The words of the name, and the parts of its words with a hyphen.
+        number_set = set(words)
+        for word in words:
+            number_set.update(word.split("-"))
+
+        best_key = None
+        best_score = 0.0
+        for key, count in shared.items():
+            # The model number, E.g. 8250u of i5-8250u, must be in the name.
+            if key[len(key)-1].split("-").pop() not in number_set:
+                continue
+            score = 2 * count / (self.key_trigram_count[key] + len(trigrams))
+            if score > best_score or (score == best_score and best_key and len(key) > len(best_key)):
+                best_key = key
+                best_score = score
+
+        if best_key is None or best_score < approximate_threshold:
+            return [], None, best_score
+        return self.prefer_vendor(self.key_ids[best_key], name), "approximate", best_score
+
+    def prefer_vendor(self, model_ids, name):
+        # If the same model is listed by more than one vendor, use the vendor in the name.
+        if len(model_ids) < 2 or self.vendor_codes is None:
+            return model_ids
+        words = name.lower().replace("(r)", " ").split()
+        named = {vendor_words[word] for word in words if word in vendor_words}
+        preferred = [model_id for model_id in model_ids
+            if self.vendors[self.vendor_codes[model_id]] in named]
+        return preferred or model_ids
+
+
+if __name__=="__main__":
+
+    main()
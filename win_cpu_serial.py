@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+#
+# win_cpu_serial.py
+#
+# Formats of the CPU tables in sub_directory win_cpu/
+# get_win_tables.py writes the tables in the format given with --format:
+# json      Indented .json, easy to read. The default.
+# compact   .json without spaces, written in pieces as it is encoded.
+# orjson    Compact .json encoded by orjson. Needs: pip install orjson
+# msgpack   Binary .msgpack file. Needs: pip install msgpack
+#
+# The programs that read the tables use load_table(), which reads any of them into
+# a CpuTable, see win_cpu_table.py. The rows are decoded into the table, without a
+# dictionary for each row. So .json is read by json, even if orjson is installed.
+# The serializers write the dictionary of CpuTable.to_dict()
+# Programs that only need the CPU models use load_keys(). It does not build the
+# {'Manufacturer': ..., 'Brand': ...} of each model, and leaves out the header row.
+
+import os
+import csv
+import io
+import json
+
+from win_cpu_table import table_hook
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Table file extensions, in the order they are looked for.
+table_extensions = [".json", ".msgpack"]
+write_size = 64 * 1024
+
+
+class PrettyJson:
+    extension = ".json"
+
+    def dump(self, data_dict, fout):
+        fout.write(json.dumps(data_dict, indent = 4).encode("utf-8"))
+
+
+class CompactJson:
+    """
+    Write the .json in pieces of about write_size, so the whole document is
+    never one string.
+    """
+    extension = ".json"
+    encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def dump(self, data_dict, fout):
+        piece_list = []
+        size = 0
+        for piece in self.encoder.iterencode(data_dict):
+            piece_list.append(piece)
+            size += len(piece)
+            if size >= write_size:
+                fout.write("".join(piece_list).encode("utf-8"))
+                piece_list = []
+                size = 0
+        fout.write("".join(piece_list).encode("utf-8"))
+
+
+class OrJson:
+    extension = ".json"
+
+    def dump(self, data_dict, fout):
+        fout.write(orjson.dumps(data_dict))
+
+
+class MsgPack:
+    extension = ".msgpack"
+
+    def dump(self, data_dict, fout):
+        fout.write(msgpack.packb(data_dict))
+
+
+serializer_types = {"json": PrettyJson, "compact": CompactJson, "orjson": OrJson,
+    "msgpack": MsgPack}
+# The module each format needs, if any.
+serializer_modules = {"orjson": orjson, "msgpack": msgpack}
+
+
+def get_serializer(name):
+    """
+    Return the serializer of the format. Raises ValueError if its module is not
+    installed.
+    """
+    if name in serializer_modules and serializer_modules[name] is None:
+        raise ValueError("The {0} format needs: pip install {0}".format(name))
+    return serializer_types[name]()
+
+
+def loads(content, filename):
+    # Decode the bytes of a table file into a CpuTable. The format is from the extension.
+    # orjson has no object_pairs_hook, so it would make a dictionary for each row.
+    if filename.endswith(".msgpack"):
+        if msgpack is None:
+            raise ValueError("Reading {} needs: pip install msgpack".format(filename))
+        return msgpack.unpackb(content, object_pairs_hook=table_hook)
+    return json.loads(content, object_pairs_hook=table_hook)
+
+
+def load_table(filename):
+    with open(filename, 'rb') as fin:
+        return loads(fin.read(), filename)
+
+
+def loads_keys(content, filename):
+    """
+    Decode only the CPU models of a table file, .json, .msgpack or .csv, in the
+    order of the table. The header row, Model, Manufacturer, Brand, is left out.
+    """
+    if filename.endswith(".msgpack"):
+        if msgpack is None:
+            raise ValueError("Reading {} needs: pip install msgpack".format(filename))
+        unpacker = msgpack.Unpacker(raw=False)
+        unpacker.feed(content)
+        key_list = []
+        for index in range(unpacker.read_map_header()):
+            key = unpacker.unpack()
+            if key == "Model":
+                # Could be the header row.
+                if unpacker.unpack().get("Manufacturer") == "Manufacturer":
+                    continue
+            else:
+                unpacker.skip()
+            key_list.append(key)
+        return key_list
+    if filename.endswith(".csv"):
+        return [row[0] for row in csv.reader(io.StringIO(content.decode("utf-8")))
+            if row and not (len(row) > 1 and row[1] == "Manufacturer")]
+    return json.loads(content, object_pairs_hook=keys_hook)
+
+
+def keys_hook(pairs):
+    # Called by json for each object, the rows first, then the table.
+    if pairs and isinstance(pairs[0][1], str):
+        # A row: {'Manufacturer': 'Intel', 'Brand': 'Atom'}. Only mark the header row.
+        return False if pairs[0][1] == "Manufacturer" else None
+    return [key for key, value in pairs if value is not False]
+
+
+def load_keys(filename):
+    with open(filename, 'rb') as fin:
+        return loads_keys(fin.read(), filename)
+
+
+def find_table(path):
+    """
+    Return the table file of the path without an extension, in any format, or None.
+    From: win_cpu/windows-11-24h2-intel-2025-02-28
+    Get:  win_cpu/windows-11-24h2-intel-2025-02-28.json
+    """
+    for extension in table_extensions:
+        if os.path.exists(path + extension):
+            return path + extension
+    return None
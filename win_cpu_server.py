@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+#
+# win_cpu_server.py
+#
+# Answer CPU lookups over HTTP, with the index kept in memory. For services that
+# look up CPU's for every request, instead of running win_cpu_lookup.py each time.
+#
+# $ python3 win_cpu_server.py
+# $ curl "http://127.0.0.1:8642/lookup?model=i5-8250U&model=Ryzen+7+5800X"
+# $ curl -d '["Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz"]' http://127.0.0.1:8642/lookup
+# $ curl "http://127.0.0.1:8642/unsupported?vendor=AMD"
+# $ curl "http://127.0.0.1:8642/status"
+# $ curl "http://127.0.0.1:8642/feed?offset=18344"
+#
+# /lookup returns the same json as win_cpu_lookup.py --json
+# /unsupported returns the CPU's not supported by the latest Windows, of each vendor:
+# {'Intel': ['3205U', ...], 'AMD': [...]}. The same as the master lists.
+# /feed returns the changes to the tables since the offset, from win_cpu_feed.jsonl:
+# {'records': [{'release': 'windows_11_24h2', ...}, ...], 'offset': 18590}
+#
+# CPU names that are not a model number are matched with win_cpu_match.py. The
+# matches are kept in a cache of the most recently used names, by their normalized
+# words, so "... CPU @ 1.60GHz" and "... CPU @ 1.80GHz" are only matched once.
+#
+# The .json files in win_cpu/ are checked every --watch seconds. When get_win_tables.py
+# has written new tables, the index is built again and replaces the one in use.
+# Lookups already started finish with the old index. The cache starts again empty.
+# If another program rebuilds win_cpu_index.bin, it is loaded.
+
+import os
+import sys
+import argparse
+import contextlib
+import http.server
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+
+import win_cpu_feed
+import win_cpu_index
+import win_cpu_lookup
+import win_cpu_match
+import win_cpu_serial
+
+host_default = "127.0.0.1"
+port_default = 8642
+cache_size_default = 4096
+watch_default = 5.0
+# Most bytes in the body of a POST.
+body_size_max = 1024 * 1024
+
+
+def main():
+    args = get_args()
+
+    lookup_server = LookupServer(args.index, args.cache_size)
+    print("\nLoaded {}: {} releases, {} CPU models.".format(args.index,
+        len(lookup_server.state.cpu_index.releases), len(lookup_server.state.cpu_index.models)))
+
+    if args.watch:
+        threading.Thread(target=lookup_server.watch, args=(args.watch,), daemon=True).start()
+
+    server = http.server.ThreadingHTTPServer((args.host, args.port), LookupHandler)
+    server.daemon_threads = True
+    server.lookup_server = lookup_server
+    server.verbose = args.verbose
+    print("Listening on: http://{}:{}/".format(args.host, server.server_address[1]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    server.server_close()
+
+
+def get_args():
+    parser = argparse.ArgumentParser(
+        description="Answer CPU lookups over HTTP, with the index kept in memory.")
+    parser.add_argument("--host", default=host_default,
+        help="Address to listen on. Default: {}".format(host_default))
+    parser.add_argument("-p", "--port", type=int, default=port_default,
+        help="Port to listen on. Default: {}".format(port_default))
+    parser.add_argument("--index", default=win_cpu_index.index_file,
+        help="Index file. Default: {}".format(win_cpu_index.index_file))
+    parser.add_argument("--cache-size", type=int, default=cache_size_default,
+        help="CPU names to keep matches for. Default: {}".format(cache_size_default))
+    parser.add_argument("--watch", type=float, default=watch_default,
+        help="Seconds between checks for new tables. 0 to not check. Default: {}".format(
+            watch_default))
+    parser.add_argument("-v", "--verbose", action="store_true",
+        help="Print each request.")
+    args = parser.parse_args()
+    if args.cache_size < 1 or args.watch < 0:
+        parser.error("--cache-size must be 1 or more and --watch 0 or more")
+    return args
+
+
+class LruCache:
+    """
+    Dictionary of the most recently used keys, up to size keys. Shared by the
+    request threads.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.items:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            if len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+
+class IndexState:
+    """
+    The loaded index, its matcher, match cache and unsupported lists. A new
+    IndexState replaces the old one as a whole, so a lookup uses one index.
+    """
+    def __init__(self, cpu_index, cache_size):
+        self.cpu_index = cpu_index
+        # Built before the state is used by the request threads.
+        cpu_index.get_model_ids()
+        self.matcher = win_cpu_lookup.get_matcher(cpu_index)
+        self.cache = LruCache(cache_size)
+        self.loaded = time.time()
+        self.unsupported = {vendor: [] for vendor in cpu_index.vendors}
+        for model_id, model in enumerate(cpu_index.models):
+            if cpu_index.flags[model_id] & win_cpu_index.flag_unsupported:
+                self.unsupported[cpu_index.vendors[cpu_index.vendor_codes[model_id]]].append(model)
+        for model_list in self.unsupported.values():
+            model_list.sort()
+
+    def match(self, name):
+        # The vendor in the name is part of the key, as it is used to choose
+        # between the same model of two vendors.
+        words = name.lower().replace("(r)", " ").split()
+        key = (win_cpu_match.normalize_model(name),
+            tuple(sorted({word for word in words if word in win_cpu_match.vendor_words})))
+        result = self.cache.get(key)
+        if result is None:
+            result = self.matcher.match(name)
+            self.cache.put(key, result)
+        return result
+
+
+class LookupServer:
+    def __init__(self, index_filename, cache_size):
+        self.index_filename = index_filename
+        self.cache_size = cache_size
+        self.reload_lock = threading.Lock()
+        self.table_signature = get_table_signature()
+        if not os.path.exists(index_filename) or index_is_old(index_filename):
+            self.build()
+        self.index_mtime = os.stat(index_filename).st_mtime_ns
+        self.state = IndexState(win_cpu_index.load_index(index_filename), cache_size)
+
+    def lookup(self, model_list):
+        state = self.state
+        return win_cpu_lookup.lookup(model_list, state.cpu_index, state.match)
+
+    def status(self):
+        state = self.state
+        return {
+            "index": self.index_filename,
+            "loaded": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(state.loaded)),
+            "releases": list(state.cpu_index.releases),
+            "models": len(state.cpu_index.models),
+            "cache": {"size": len(state.cache.items), "hits": state.cache.hits,
+                "misses": state.cache.misses},
+        }
+
+    def build(self):
+        """
+        Build the index from win_cpu/ in a new file, then replace the index file.
+        A mapped old index file is not changed.
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            win_cpu_index.build_index(self.index_filename + ".tmp")
+        os.replace(self.index_filename + ".tmp", self.index_filename)
+
+    def reload(self):
+        """
+        Build the index again if the tables in win_cpu/ have changed, or load it
+        if the index file has changed. Returns True if the index was replaced.
+        """
+        with self.reload_lock:
+            table_signature = get_table_signature()
+            if table_signature != self.table_signature and table_signature:
+                self.build()
+            self.table_signature = table_signature
+            index_mtime = os.stat(self.index_filename).st_mtime_ns
+            if index_mtime == self.index_mtime:
+                return False
+            state = IndexState(win_cpu_index.load_index(self.index_filename), self.cache_size)
+            self.index_mtime = index_mtime
+            # One assignment, so each lookup sees the old or the new index.
+            self.state = state
+            return True
+
+    def watch(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                if self.reload():
+                    print("Index replaced: {} CPU models.".format(len(self.state.cpu_index.models)))
+            except (OSError, ValueError) as error:
+                # E.g. tables being written. Keep the index in use and try again.
+                print("Index not replaced:", error, file=sys.stderr)
+
+
+def get_table_signature():
+    # The name, size and modification time of each table file in win_cpu/
+    # Imported here, as get_win_unsupported is only needed to find the tables.
+    import get_win_unsupported
+    signature = []
+    if not os.path.isdir(get_win_unsupported.sub_directory):
+        return ()
+    for entry in os.scandir(get_win_unsupported.sub_directory):
+        if os.path.splitext(entry.name)[1] in win_cpu_serial.table_extensions:
+            stat = entry.stat()
+            signature.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(sorted(signature))
+
+
+def index_is_old(index_filename):
+    # True if a table in win_cpu/ is newer than the index.
+    index_mtime = os.stat(index_filename).st_mtime_ns
+    return any(mtime > index_mtime for name, size, mtime in get_table_signature())
+
+
+class LookupHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        lookup_server = self.server.lookup_server
+        if url.path == "/lookup":
+            self.send_json(lookup_server.lookup(query.get("model", [])))
+        elif url.path == "/unsupported":
+            unsupported = lookup_server.state.unsupported
+            vendor_list = query.get("vendor")
+            if vendor_list:
+                unsupported = {vendor: model_list for vendor, model_list in unsupported.items()
+                    if vendor.lower() in {name.lower() for name in vendor_list}}
+            self.send_json(unsupported)
+        elif url.path == "/status":
+            self.send_json(lookup_server.status())
+        elif url.path == "/feed":
+            try:
+                record_list, offset = win_cpu_feed.read_feed(int(query.get("offset", ["0"])[0]))
+            except ValueError as error:
+                self.send_json({"error": str(error)}, 400)
+                return
+            self.send_json({"records": record_list, "offset": offset})
+        else:
+            self.send_json({"error": "Not found: {}".format(url.path)}, 404)
+
+    def do_POST(self):
+        # The body is a json list of CPU names, or one name.
+        if urlparse(self.path).path != "/lookup":
+            self.send_json({"error": "Not found: {}".format(self.path)}, 404)
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_json({"error": "Content-Length must be a number of bytes"}, 400)
+            return
+        if length > body_size_max:
+            self.send_json({"error": "Body too large"}, 413)
+            return
+        try:
+            model_list = json.loads(self.rfile.read(length))
+        except ValueError:
+            self.send_json({"error": "Body is not json"}, 400)
+            return
+        if isinstance(model_list, str):
+            model_list = [model_list]
+        if not isinstance(model_list, list) or not all(isinstance(model, str) for model in model_list):
+            self.send_json({"error": "Body must be a list of CPU names"}, 400)
+            return
+        self.send_json(self.server.lookup_server.lookup(model_list))
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+if __name__=="__main__":
+
+    main()
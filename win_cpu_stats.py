@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+#
+# win_cpu_stats.py
+#
+# Timings and counters for each link and stage of get_win_tables.py and
+# get_win_unsupported.py. Off unless the programs are run with --stats FILE,
+# or a hook is added.
+#
+# Each record is a dictionary like this:
+# {'stage': 'fetch', 'item': 'https://learn.microsoft.com/...', 'seconds': 0.41,
+#  'http_status': 200, 'bytes_downloaded': 182345}
+#
+# Counters used by the stages:
+# http_status, retries, bytes_downloaded, bytes_read, rows_parsed, rows_dropped, output_bytes,
+# tables_linked, unsupported (CPU's not supported by the latest release, in the diff stage)
+#
+# A hook is called with each record as it is made. E.g. to print them:
+# win_cpu_stats.stats.add_hook(print)
+
+import contextlib
+import json
+import threading
+import time
+
+
+class Stats:
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+        self.hooks = []
+        self.lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+        self.enabled = True
+
+    @contextlib.contextmanager
+    def stage(self, stage, item=None):
+        """
+        Time the code in the with block. Counters can be added to the yielded
+        record. When not enabled the record is not kept.
+        """
+        record = {"stage": stage, "item": item}
+        if not self.enabled:
+            yield record
+            return
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self.add(record)
+
+    def add(self, record):
+        # Records may be added from the worker threads.
+        with self.lock:
+            self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+
+    def summary(self):
+        """
+        Return the records and the totals of each stage:
+        {'records': [...], 'totals': {'fetch': {'count': 16, 'seconds': 6.2, ...}, ...}}
+        """
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record["stage"], {"count": 0})
+            total["count"] += 1
+            for key, value in record.items():
+                if key == "http_status" or isinstance(value, bool):
+                    continue
+                if isinstance(value, (int, float)):
+                    total[key] = total.get(key, 0) + value
+        return {"records": self.records, "totals": totals}
+
+    def dump(self, filename):
+        with open(filename, 'w') as fout:
+            fout.write(json.dumps(self.summary(), indent = 4))
+
+
+# Shared by the programs.
+stats = Stats()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+#
+# win_cpu_table.py
+#
+# A table of Supported CPU's in memory. The rows are kept in parallel lists by row
+# number, instead of a dictionary for each row:
+# models              ['Model', 'x7211E', 'x7213E', ...]
+# manufacturer_codes  [0, 1, 1, ...]   into manufacturers.values ['Manufacturer', 'Intel']
+# brand_codes         [0, 1, 1, ...]   into brands.values ['Brand', 'Atom', 'Celeron', ...]
+# Each table only has a few manufacturers and brands, so a row is a string and two
+# small numbers. The strings are interned, so the same model, manufacturer and
+# brand in the tables of each release are kept once.
+#
+# The table is read like the dictionary it replaces, with the header row first:
+# {'Model': {'Manufacturer': 'Manufacturer', 'Brand': 'Brand'},
+#  'x7211E': {'Manufacturer': 'Intel', 'Brand': 'Atom'}, ...}
+# E.g. table.get('x7211E') returns ('Intel', 'Atom'). to_dict() returns the
+# dictionary to write to a file.
+
+import sys
+from array import array
+
+
+class Category:
+    """
+    The values of a column, each kept once. code() returns the number of a value.
+    """
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(sys.intern(value))
+            self.codes[self.values[code]] = code
+        return code
+
+
+class CpuTable:
+    __slots__ = ("models", "manufacturers", "brands", "manufacturer_codes", "brand_codes",
+        "row_ids")
+
+    def __init__(self):
+        self.models = []
+        self.manufacturers = Category()
+        self.brands = Category()
+        self.manufacturer_codes = array("H")
+        self.brand_codes = array("H")
+        # Row number of each model.
+        self.row_ids = {}
+
+    @classmethod
+    def from_dict(cls, data_dict):
+        # From: {'x7211E': {'Manufacturer': 'Intel', 'Brand': 'Atom'}, ...}
+        table = cls()
+        for model, value in data_dict.items():
+            table.add(model, value["Manufacturer"], value["Brand"])
+        return table
+
+    def add(self, model, manufacturer, brand):
+        """
+        Add a row. A model already in the table keeps its place, and gets the
+        new manufacturer and brand, as when setting a dictionary key.
+        """
+        row_id = self.row_ids.get(model)
+        if row_id is None:
+            row_id = len(self.models)
+            self.models.append(sys.intern(model))
+            self.row_ids[self.models[row_id]] = row_id
+            self.manufacturer_codes.append(0)
+            self.brand_codes.append(0)
+        self.manufacturer_codes[row_id] = self.manufacturers.code(manufacturer)
+        self.brand_codes[row_id] = self.brands.code(brand)
+
+    def row(self, row_id):
+        # Return (model, manufacturer, brand)
+        return (self.models[row_id], self.manufacturers.values[self.manufacturer_codes[row_id]],
+            self.brands.values[self.brand_codes[row_id]])
+
+    def get(self, model, default=None):
+        # Return (manufacturer, brand) of the model, or default.
+        row_id = self.row_ids.get(model)
+        if row_id is None:
+            return default
+        return self.row(row_id)[1:]
+
+    def rows(self):
+        # Yield (model, manufacturer, brand) of each row, with the header row.
+        for row_id in range(len(self.models)):
+            yield self.row(row_id)
+
+    def cpu_rows(self):
+        # Yield (model, manufacturer, brand) of each row, without the header row.
+        for row in self.rows():
+            if row[1] != "Manufacturer":
+                yield row
+
+    def to_dict(self):
+        return {model: {"Manufacturer": manufacturer, "Brand": brand}
+            for model, manufacturer, brand in self.rows()}
+
+    def __len__(self):
+        # Rows, with the header row. The same as len() of the dictionary.
+        return len(self.models)
+
+    def __contains__(self, model):
+        return model in self.row_ids
+
+    def __iter__(self):
+        return iter(self.models)
+
+
+def table_hook(pairs):
+    """
+    Called by json and msgpack for each object, the rows first, then the table.
+    A row becomes a tuple, and the table a CpuTable, so there is no dictionary
+    for each row.
+    """
+    if pairs and isinstance(pairs[0][1], str):
+        # A row: [('Manufacturer', 'Intel'), ('Brand', 'Atom')]
+        value = dict(pairs)
+        return (value["Manufacturer"], value["Brand"])
+    table = CpuTable()
+    for model, (manufacturer, brand) in pairs:
+        table.add(model, manufacturer, brand)
+    return table
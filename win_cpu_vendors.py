@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+#
+# win_cpu_vendors.py
+#
+# The CPU vendors of the Microsoft Supported CPU lists.
+# The key is the vendor in the links and filenames. E.g.
+# windows-11-24h2-supported-qualcomm-processors
+# win_cpu/windows-11-24h2-qualcomm-2024-10-01.json
+# The value is the vendor in titles, the master files and the console. E.g. Qualcomm
+#
+# To add a vendor, add it here and add its links to get_win_tables.py
+
+vendors = {
+    "intel": "Intel",
+    "amd": "AMD",
+    "qualcomm": "Qualcomm",
+}
+
+
+def get_vendor(word_list):
+    """
+    Return the vendor key of the first word that is a vendor, or None. E.g.
+    From: ['windows', '11', 'supported', 'amd', 'processors']
+    Get:  amd
+    """
+    for word in word_list:
+        if word in vendors:
+            return word
+    return None
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+#
+# wincpu.py
+#
+# One command for the programs in this repository:
+# $ python3 wincpu.py scrape              get_win_tables.py
+# $ python3 wincpu.py diff                get_win_unsupported.py
+# $ python3 wincpu.py lookup i5-8250U     win_cpu_lookup.py
+# $ python3 wincpu.py report              get_win_changelog.py
+# $ python3 wincpu.py index               win_cpu_index.py
+# $ python3 wincpu.py fleet inventory.csv win_cpu_fleet.py
+# $ python3 wincpu.py bench               win_cpu_bench.py
+# $ python3 wincpu.py server              win_cpu_server.py
+# $ python3 wincpu.py feed --offset 18344  win_cpu_feed.py
+#
+# The options of each command are those of its program. E.g.
+# $ python3 wincpu.py scrape --offline
+# $ python3 wincpu.py lookup --help
+#
+# A program is only imported when its command is run. So a lookup does not load
+# requests, multiprocessing or sqlite3, and starts quickly.
+
+import os
+import sys
+import importlib
+
+commands = {
+    "scrape": ("get_win_tables", "Get the supported CPU tables from the Microsoft website."),
+    "diff": ("get_win_unsupported", "Create the lists of CPU's not supported by the latest Windows."),
+    "lookup": ("win_cpu_lookup", "Look up the Windows releases that support CPU models."),
+    "report": ("get_win_changelog", "Report the CPU's added and removed between Windows releases."),
+    "index": ("win_cpu_index", "Build or query the index of releases supporting each CPU model."),
+    "fleet": ("win_cpu_fleet", "Classify the computers of an inventory .csv file by their CPU."),
+    "bench": ("win_cpu_bench", "Benchmark the stages of scrape and diff offline."),
+    "server": ("win_cpu_server", "Answer CPU lookups over HTTP, with the index kept in memory."),
+    "feed": ("win_cpu_feed", "Print the changes to the Supported CPU lists since an offset of the feed."),
+}
+
+
+def main():
+    """
+    Run the program of the command with the rest of the command line.
+    """
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print_usage()
+        sys.exit(0 if len(sys.argv) > 1 and sys.argv[1] in ("-h", "--help") else 2)
+
+    command = sys.argv[1]
+    module_name = commands[command][0]
+    # The program reads its options from sys.argv, and uses sys.argv[0] in its help.
+    sys.argv = [os.path.basename(sys.argv[0]) + " " + command] + sys.argv[2:]
+    importlib.import_module(module_name).main()
+
+
+def print_usage():
+    print("usage: {} COMMAND [options]\n".format(os.path.basename(sys.argv[0])))
+    print("Commands:")
+    for command, (module_name, description) in commands.items():
+        print("  {:<8} {}".format(command, description))
+    print("\nUse COMMAND --help for the options of a command.")
+
+
+if __name__=="__main__":
+
+    main()